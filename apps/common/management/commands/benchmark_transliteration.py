@@ -0,0 +1,88 @@
+import subprocess
+import time
+import types
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.text_services import cyrillic_latin_translator
+
+MODULE_PATH = "apps/text_services/cyrillic_latin_translator.py"
+
+SHORT_LATIN = "o‘zbekiston temir yo‘llari"
+SHORT_CYRILLIC = "ўзбекистон темир йўллари"
+
+LONG_LATIN = (
+    "Kompaniya mobil aloqa, internet va televideniye xizmatlarini taqdim etadi. "
+    "Abonentlar uchun yangi tariflar, aksiyalar va konsert chiptalari mavjud. "
+    "Administratsiya har oyda informatsiya byulletenini e’lon qiladi. "
+) * 40
+LONG_CYRILLIC = cyrillic_latin_translator.to_cyrillic(LONG_LATIN)
+
+CASES = (
+    ("to_cyrillic", "short", SHORT_LATIN),
+    ("to_cyrillic", "long", LONG_LATIN),
+    ("to_latin", "short", SHORT_CYRILLIC),
+    ("to_latin", "long", LONG_CYRILLIC),
+)
+
+
+def time_per_call(func, text, seconds):
+    """Average seconds per call of func(text), calling it for about `seconds` (at least once)."""
+    count = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while True:
+        func(text)
+        count += 1
+        now = time.perf_counter()
+        if now >= deadline:
+            return (now - started) / count
+
+
+class Command(BaseCommand):
+    help = (
+        "Time cyrillic_latin_translator.to_cyrillic / to_latin on short queries and a long "
+        "description, optionally side by side with the module as of another git revision."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seconds", type=float, default=1, help="Duration of each measurement.")
+        parser.add_argument(
+            "--against", metavar="REV",
+            help=f"Git revision whose {MODULE_PATH} to compare with, e.g. the commit before a change.",
+        )
+
+    def handle(self, *args, **options):
+        seconds = options["seconds"]
+        other = self.load_revision(options["against"]) if options["against"] else None
+
+        for name, size, text in CASES:
+            current = getattr(cyrillic_latin_translator, name)
+            after = time_per_call(current, text, seconds) * 1_000_000
+            line = f"{name:<12} {size:<6} {len(text):>6} chars"
+            if other is None:
+                self.stdout.write(f"{line}  {after:>10.1f} µs/call")
+                continue
+
+            previous = getattr(other, name)
+            before = time_per_call(previous, text, seconds) * 1_000_000
+            same = "" if previous(text) == current(text) else "  OUTPUT DIFFERS"
+            self.stdout.write(
+                f"{line}  {before:>10.1f} -> {after:>8.1f} µs/call  ({before / after:,.0f}x){same}"
+            )
+        self.stdout.write(self.style.SUCCESS("done."))
+
+    @staticmethod
+    def load_revision(revision):
+        """The translator module as of `revision`, loaded from git without touching the working tree."""
+        try:
+            source = subprocess.run(
+                ["git", "show", f"{revision}:{MODULE_PATH}"],
+                cwd=settings.BASE_DIR, capture_output=True, check=True, text=True,
+            ).stdout
+        except (OSError, subprocess.CalledProcessError) as e:
+            raise CommandError(f"cannot read {MODULE_PATH} at {revision}: {e}") from e
+        module = types.ModuleType(f"cyrillic_latin_translator@{revision}")
+        exec(compile(source, f"{revision}:{MODULE_PATH}", "exec"), module.__dict__)
+        return module
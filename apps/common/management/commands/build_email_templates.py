@@ -0,0 +1,90 @@
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+TAG_RE = re.compile(r"<([a-zA-Z][a-zA-Z0-9]*)(\s[^<>]*?)?(\s*/?)>")
+CLASS_RE = re.compile(r'\sclass="([^"]*)"')
+STYLE_RE = re.compile(r'\sstyle="([^"]*)"')
+RULE_RE = re.compile(r"([^{}]+)\{([^{}]*)\}")
+COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+BLOCK_RE = re.compile(r"{%\s*block content\s*%}{%\s*endblock\s*%}")
+
+HEADER = "{# Generated by manage.py build_email_templates from emails/src/%s, edit that file instead. #}"
+
+
+def parse_css(css):
+    """[(selector, declarations)] of `tag` and `.class` rules, in source order."""
+    rules = []
+    for selectors, declarations in RULE_RE.findall(COMMENT_RE.sub("", css)):
+        declarations = " ".join(declarations.split()).rstrip(";")
+        for selector in selectors.split(","):
+            rules.append((selector.strip(), declarations))
+    return rules
+
+
+def inline_css(source, rules):
+    """
+    Premailer-style inlining: move the declarations of matching rules into
+    each tag's style attribute and drop the class. Tag rules come first, then
+    class rules, then the tag's own style, so specificity holds in mail
+    clients that ignore <style>.
+    """
+    def apply(match):
+        tag, attrs, closing = match.group(1), match.group(2) or "", match.group(3)
+        class_match = CLASS_RE.search(attrs)
+        classes = class_match.group(1).split() if class_match else []
+
+        declarations = [d for selector, d in rules if selector == tag.lower()]
+        declarations += [d for selector, d in rules if selector.startswith(".") and selector[1:] in classes]
+        style_match = STYLE_RE.search(attrs)
+        if style_match:
+            declarations.append(style_match.group(1).rstrip(";"))
+        if not declarations:
+            return match.group(0)
+
+        attrs = STYLE_RE.sub("", CLASS_RE.sub("", attrs)).rstrip()
+        closing = " /" if closing.strip() else ""
+        return f'<{tag}{attrs} style="{"; ".join(declarations)}"{closing}>'
+
+    return TAG_RE.sub(apply, source)
+
+
+class Command(BaseCommand):
+    help = (
+        "Build templates/emails/<name>.<language>.html from emails/src: place each content "
+        "template into layout.html and inline email.css into style attributes. Run after "
+        "editing anything in emails/src and commit the result."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check", action="store_true", help="Only report templates that are out of date; exit 1 if any."
+        )
+
+    def handle(self, *args, **options):
+        directory = Path(settings.BASE_DIR) / "templates" / "emails"
+        source = directory / "src"
+        layout = (source / "layout.html").read_text(encoding="utf-8")
+        rules = parse_css((source / "email.css").read_text(encoding="utf-8"))
+
+        stale = []
+        for path in sorted(source.glob("*.*.html")):
+            content = path.read_text(encoding="utf-8")
+            html = HEADER % path.name + inline_css(BLOCK_RE.sub(lambda _, content=content: content, layout), rules)
+            target = directory / path.name
+            if target.exists() and target.read_text(encoding="utf-8") == html:
+                continue
+            stale.append(target.name)
+            if not options["check"]:
+                target.write_text(html, encoding="utf-8")
+                self.stdout.write(f"{target.name}: written")
+
+        if options["check"]:
+            if stale:
+                self.stderr.write(f"out of date: {', '.join(stale)}")
+                raise SystemExit(1)
+            self.stdout.write(self.style.SUCCESS("all email templates are up to date."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"done, {len(stale)} templates written."))
@@ -1,10 +1,14 @@
 import uuid
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 
+from apps.text_services import cyrillic_latin_translator
+from apps.text_services.q_processors import QSearchNormalizer
+
 try:
     from transliterate import translit
 
@@ -12,6 +16,8 @@ try:
 except ImportError:
     HAS_TRANSLITERATE = False
 
+latin_search_normalizer = QSearchNormalizer(cyrillic_latin_translator.LATIN)
+
 
 class BaseModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
@@ -49,6 +55,43 @@ class SoftDeleteModel(models.Model):
         self.save(update_fields=["is_deleted", "deleted_at"])
 
 
+class TransliteratedSearchMixin(models.Model):
+    """
+    Keeps a denormalized `search_latin` copy of `search_source_fields`,
+    transliterated to latin and lowercased, so a query normalized the same
+    way can hit one indexed column.
+    """
+    search_latin = models.TextField(blank=True, default="", editable=False)
+
+    search_source_fields = ()
+
+    class Meta:
+        abstract = True
+
+    def get_search_source(self):
+        values = (getattr(self, field, None) for field in self.search_source_fields)
+        return " ".join(dict.fromkeys(value for value in values if value))
+
+    def update_search_shadow(self):
+        source = self.get_search_source()
+        self.search_latin = latin_search_normalizer.process(source)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields', None)
+        if update_fields is None or set(update_fields) & set(self.search_source_fields):
+            self.update_search_shadow()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'search_latin'}
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def search_shadow_indexes(prefix):
+        """Trigram index serving contains / (word) similarity lookups."""
+        return [
+            GinIndex(fields=['search_latin'], name=f'{prefix}_search_latin_trgm', opclasses=['gin_trgm_ops']),
+        ]
+
+
 class VersionHistory(BaseModel):
     version = models.CharField(_("Version"), max_length=64)
     required = models.BooleanField(_("Required"), default=True)
@@ -0,0 +1,53 @@
+import smtplib
+import threading
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+
+
+class MailConnectionPool:
+    """
+    One open email backend connection per worker thread, reused for every
+    message sent through the pool instead of a new SMTP session per message.
+
+    The connection is re-opened after `max_age` seconds, before the server
+    drops it for idling, and once more if it turns out to be disconnected.
+    Backends without a real connection (console, locmem) work unchanged.
+    """
+
+    def __init__(self, max_age=60):
+        self.max_age = max_age
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and time.monotonic() - self._local.opened_at < self.max_age:
+            return connection
+
+        self.close()
+        connection = get_connection(fail_silently=False)
+        connection.open()
+        self._local.connection = connection
+        self._local.opened_at = time.monotonic()
+        return connection
+
+    def send_messages(self, messages):
+        """Send EmailMessages over the pooled connection; returns the number sent."""
+        try:
+            return self._connection().send_messages(messages)
+        except smtplib.SMTPServerDisconnected:
+            self.close()
+            return self._connection().send_messages(messages)
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)
+        self._local.connection = None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+
+mail_connections = MailConnectionPool(max_age=getattr(settings, "EMAIL_CONNECTION_MAX_AGE", 60))
@@ -0,0 +1,326 @@
+import json
+import smtplib
+import time
+import uuid
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django_redis import get_redis_connection
+
+from apps.common.services.mail import mail_connections
+
+# Move up to ARGV[1] entries from the queue into this drain's processing list
+# and lease it until ARGV[3]. KEYS: queue, processing list, leases; ARGV:
+# batch size, batch id, lease deadline.
+CLAIM_SCRIPT = """
+local entries = {}
+for _ = 1, tonumber(ARGV[1]) do
+    local entry = redis.call('LMOVE', KEYS[1], KEYS[2], 'LEFT', 'RIGHT')
+    if not entry then
+        break
+    end
+    entries[#entries + 1] = entry
+end
+if #entries > 0 then
+    redis.call('ZADD', KEYS[3], ARGV[3], ARGV[2])
+end
+return entries
+"""
+
+# Put what is left of an abandoned processing list back at the head of the
+# queue, in order. KEYS: processing list, queue, leases; ARGV: batch id.
+RECOVER_SCRIPT = """
+local moved = 0
+while redis.call('LMOVE', KEYS[1], KEYS[2], 'RIGHT', 'LEFT') do
+    moved = moved + 1
+end
+redis.call('ZREM', KEYS[3], ARGV[1])
+return moved
+"""
+
+
+class MailDispatcher:
+    """
+    Queue for bulk email (announcements, signup spikes).
+
+    enqueue() only appends one JSON entry per recipient to a Redis list; the
+    drain_mail_queue task claims them in batches and sends each batch over
+    the worker's pooled SMTP connection (MailConnectionPool), so a batch is
+    one SMTP session instead of one per message.
+
+    - Delivery: a batch is moved (LMOVE) into a processing list leased to
+      the drain, and every entry is acknowledged only once it was sent,
+      requeued or dead-lettered. The lease is renewed before every message
+      and outlives the task time limit; whatever a crashed drain leaves
+      behind goes back to the queue when its lease expires, so mail is sent
+      at least once, never dropped.
+
+    - Rate limit: at most MAIL_DOMAIN_RATE_LIMIT messages per recipient
+      domain per minute, shared by all workers; the rest go back to the queue.
+    - Failures: transient errors requeue the message with exponential
+      backoff until MAIL_MAX_ATTEMPTS, then it moves to the dead-letter list
+      together with the last error. Refused recipients and unexpected
+      errors (e.g. a bad header) go there at once.
+    - Metrics: running counters in a Redis hash plus the send rate of the
+      last drain, see stats().
+    """
+
+    QUEUE_KEY = "mail:queue"
+    DEAD_LETTER_KEY = "mail:dead_letter"
+    PROCESSING_KEY = "mail:processing:{batch_id}"
+    LEASES_KEY = "mail:processing"
+    LEASE_TIMEOUT = 35 * 60  # seconds, longer than CELERY_TASK_TIME_LIMIT; renewed per message
+    METRICS_KEY = "mail:metrics"
+    RATE_KEY = "mail:rate:{domain}:{minute}"
+    RETRY_DELAY = 30  # seconds before the first retry, doubled for each attempt
+
+    @staticmethod
+    def _redis():
+        return get_redis_connection("default")
+
+    @staticmethod
+    def enqueue(subject, body, recipients, from_email=None, html=None):
+        """Queue one message per recipient; returns the number queued."""
+        from_email = from_email or settings.DEFAULT_FROM_EMAIL
+        entries = [
+            json.dumps({
+                "subject": subject,
+                "body": body,
+                "html": html,
+                "from_email": from_email,
+                "to": recipient,
+                "attempts": 0,
+            })
+            for recipient in dict.fromkeys(recipients)
+        ]
+        if entries:
+            redis = MailDispatcher._redis()
+            pipe = redis.pipeline(transaction=False)
+            for start in range(0, len(entries), 1000):
+                pipe.rpush(MailDispatcher.QUEUE_KEY, *entries[start:start + 1000])
+            pipe.hincrby(MailDispatcher.METRICS_KEY, "queued", len(entries))
+            pipe.execute()
+        return len(entries)
+
+    @staticmethod
+    def pending():
+        return MailDispatcher._redis().llen(MailDispatcher.QUEUE_KEY)
+
+    @staticmethod
+    def _claim_batch(batch_size):
+        """(processing key, batch id, [raw entries]) moved from the queue to a leased list."""
+        batch_id = uuid.uuid4().hex
+        processing_key = MailDispatcher.PROCESSING_KEY.format(batch_id=batch_id)
+        entries = MailDispatcher._redis().register_script(CLAIM_SCRIPT)(
+            keys=[MailDispatcher.QUEUE_KEY, processing_key, MailDispatcher.LEASES_KEY],
+            args=[batch_size, batch_id, time.time() + MailDispatcher.LEASE_TIMEOUT],
+        )
+        return processing_key, batch_id, entries
+
+    @staticmethod
+    def recover():
+        """Return the batches of drains whose lease expired to the queue; returns how many entries."""
+        redis = MailDispatcher._redis()
+        recover = redis.register_script(RECOVER_SCRIPT)
+        moved = 0
+        for batch_id in redis.zrangebyscore(MailDispatcher.LEASES_KEY, "-inf", time.time()):
+            batch_id = batch_id.decode()
+            moved += recover(
+                keys=[
+                    MailDispatcher.PROCESSING_KEY.format(batch_id=batch_id),
+                    MailDispatcher.QUEUE_KEY,
+                    MailDispatcher.LEASES_KEY,
+                ],
+                args=[batch_id],
+            )
+        return moved
+
+    @staticmethod
+    def _ack(processing_key, raw, requeue=None, dead=None):
+        """Drop `raw` from the processing list, pushing its new state to the queue or dead letters."""
+        pipe = MailDispatcher._redis().pipeline(transaction=True)
+        pipe.lrem(processing_key, 1, raw)
+        if requeue is not None:
+            pipe.rpush(MailDispatcher.QUEUE_KEY, json.dumps(requeue))
+        if dead is not None:
+            pipe.rpush(MailDispatcher.DEAD_LETTER_KEY, json.dumps(dead))
+        pipe.execute()
+
+    @staticmethod
+    def _allowed_per_domain(counts, limit):
+        """Reserve up to `limit` sends per domain in the current minute."""
+        if not limit:
+            return dict(counts)
+        redis = MailDispatcher._redis()
+        minute = int(time.time() // 60)
+        keys = {domain: MailDispatcher.RATE_KEY.format(domain=domain, minute=minute) for domain in counts}
+
+        pipe = redis.pipeline(transaction=False)
+        for domain, count in counts.items():
+            pipe.incrby(keys[domain], count)
+            pipe.expire(keys[domain], 120)
+        totals = pipe.execute()[::2]
+
+        allowed = {}
+        pipe = redis.pipeline(transaction=False)
+        for (domain, count), total in zip(counts.items(), totals, strict=True):
+            allowed[domain] = max(0, min(count, limit - (total - count)))
+            if allowed[domain] < count:
+                pipe.decrby(keys[domain], count - allowed[domain])
+        pipe.execute()
+        return allowed
+
+    @staticmethod
+    def _build(entry):
+        message = EmailMultiAlternatives(entry["subject"], entry["body"], entry["from_email"], [entry["to"]])
+        if entry.get("html"):
+            message.attach_alternative(entry["html"], "text/html")
+        return message
+
+    @staticmethod
+    def drain(batch_size=None):
+        """Send one batch from the queue; returns {"sent", "deferred", "retried", "dead"}."""
+        batch_size = batch_size or settings.MAIL_QUEUE_BATCH_SIZE
+        MailDispatcher.recover()
+        processing_key, batch_id, raw_entries = MailDispatcher._claim_batch(batch_size)
+        result = {"sent": 0, "deferred": 0, "retried": 0, "dead": 0}
+        if not raw_entries:
+            return result
+
+        now = time.time()
+        by_domain, deferred, result["dead"] = MailDispatcher._partition(processing_key, raw_entries, now)
+        deferred.extend(MailDispatcher._apply_rate_limit(by_domain))
+        result["deferred"] = MailDispatcher._defer(processing_key, deferred)
+
+        started = time.monotonic()
+        for group in by_domain.values():
+            for raw, entry in group:
+                outcome = MailDispatcher._send(processing_key, batch_id, raw, entry, now)
+                result[outcome] += 1
+        elapsed = time.monotonic() - started
+
+        MailDispatcher._finish(processing_key, batch_id, result, elapsed)
+        return result
+
+    @staticmethod
+    def _partition(processing_key, raw_entries, now):
+        """
+        ({domain: [(raw, entry)]} ready to send, [raw entries not due yet],
+        number of unreadable entries dead-lettered).
+        """
+        by_domain = defaultdict(list)
+        deferred = []
+        dead = 0
+        for raw in raw_entries:
+            try:
+                entry = json.loads(raw)
+                domain = entry["to"].rsplit("@", 1)[-1].lower()
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                MailDispatcher._ack(processing_key, raw, dead={"raw": raw.decode(), "error": f"{type(e).__name__}: {e}"})
+                dead += 1
+                continue
+            if entry.get("retry_at", 0) > now:
+                deferred.append(raw)
+            else:
+                by_domain[domain].append((raw, entry))
+        return by_domain, deferred, dead
+
+    @staticmethod
+    def _apply_rate_limit(by_domain):
+        """Trim each domain group to what the rate limit allows; returns the raw entries cut off."""
+        allowed = MailDispatcher._allowed_per_domain(
+            {domain: len(group) for domain, group in by_domain.items()}, settings.MAIL_DOMAIN_RATE_LIMIT
+        )
+        over_limit = []
+        for domain, group in by_domain.items():
+            over_limit.extend(raw for raw, _ in group[allowed[domain]:])
+            del group[allowed[domain]:]
+        return over_limit
+
+    @staticmethod
+    def _defer(processing_key, deferred):
+        """Put entries back on the queue unchanged, before anything is sent; returns how many."""
+        if deferred:
+            pipe = MailDispatcher._redis().pipeline(transaction=True)
+            for raw in deferred:
+                pipe.lrem(processing_key, 1, raw)
+            pipe.rpush(MailDispatcher.QUEUE_KEY, *deferred)
+            pipe.execute()
+        return len(deferred)
+
+    @staticmethod
+    def _send(processing_key, batch_id, raw, entry, now):
+        """Send one entry and acknowledge it; returns "sent", "retried" or "dead"."""
+        MailDispatcher._renew_lease(batch_id)
+        try:
+            mail_connections.send_messages([MailDispatcher._build(entry)])
+        except Exception as e:
+            entry["attempts"] += 1
+            entry["error"] = f"{type(e).__name__}: {e}"
+            transient = isinstance(e, smtplib.SMTPException | OSError)
+            permanent = not transient or isinstance(e, smtplib.SMTPRecipientsRefused)
+            if permanent or entry["attempts"] >= settings.MAIL_MAX_ATTEMPTS:
+                MailDispatcher._ack(processing_key, raw, dead=entry)
+                return "dead"
+            entry["retry_at"] = now + MailDispatcher.RETRY_DELAY * 2 ** (entry["attempts"] - 1)
+            MailDispatcher._ack(processing_key, raw, requeue=entry)
+            return "retried"
+        MailDispatcher._ack(processing_key, raw)
+        return "sent"
+
+    @staticmethod
+    def _renew_lease(batch_id):
+        """Push the lease deadline forward, so a slow batch is never recovered while it is still sending."""
+        MailDispatcher._redis().zadd(
+            MailDispatcher.LEASES_KEY, {batch_id: time.time() + MailDispatcher.LEASE_TIMEOUT}, xx=True
+        )
+
+    @staticmethod
+    def _finish(processing_key, batch_id, result, elapsed):
+        pipe = MailDispatcher._redis().pipeline(transaction=True)
+        pipe.delete(processing_key)
+        pipe.zrem(MailDispatcher.LEASES_KEY, batch_id)
+        for counter in ("sent", "deferred", "retried", "dead"):
+            if result[counter]:
+                pipe.hincrby(MailDispatcher.METRICS_KEY, counter, result[counter])
+        if result["sent"]:
+            pipe.hset(MailDispatcher.METRICS_KEY, "last_rate", round(result["sent"] / max(elapsed, 1e-6), 2))
+        pipe.execute()
+
+    @staticmethod
+    def requeue_dead(limit=1000):
+        """Move dead letters back to the queue with a fresh attempt count; returns how many."""
+        redis = MailDispatcher._redis()
+        entries = redis.lrange(MailDispatcher.DEAD_LETTER_KEY, 0, limit - 1)
+        retried = []
+        for entry in map(json.loads, entries):
+            if "raw" in entry:
+                # unreadable entry, kept as it was received
+                retried.append(entry["raw"])
+                continue
+            entry["attempts"] = 0
+            entry.pop("error", None)
+            entry.pop("retry_at", None)
+            retried.append(json.dumps(entry))
+        if retried:
+            # Trim and requeue together, so a failure leaves them dead-lettered
+            pipe = redis.pipeline(transaction=True)
+            pipe.ltrim(MailDispatcher.DEAD_LETTER_KEY, len(entries), -1)
+            pipe.rpush(MailDispatcher.QUEUE_KEY, *retried)
+            pipe.execute()
+        return len(entries)
+
+    @staticmethod
+    def stats():
+        """Counters for monitoring; last_rate is messages per second of the last drain."""
+        redis = MailDispatcher._redis()
+        pipe = redis.pipeline(transaction=False)
+        pipe.hgetall(MailDispatcher.METRICS_KEY)
+        pipe.llen(MailDispatcher.QUEUE_KEY)
+        pipe.llen(MailDispatcher.DEAD_LETTER_KEY)
+        pipe.zcard(MailDispatcher.LEASES_KEY)
+        metrics, pending, dead_letters, processing = pipe.execute()
+        stats = {key.decode(): float(value) if b"." in value else int(value) for key, value in metrics.items()}
+        stats.update(pending=pending, dead_letters=dead_letters, processing_batches=processing)
+        return stats
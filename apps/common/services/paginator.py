@@ -1,7 +1,108 @@
-from rest_framework.pagination import PageNumberPagination
+import json
+from base64 import b64decode, b64encode
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 100
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over (created_at, id), newest first, with
+    opaque cursors.
+
+    A page is `WHERE (created_at, id) < cursor ORDER BY created_at DESC, id
+    DESC LIMIT n`, so it costs the same at any depth when an index ends in
+    (created_at, id), e.g. (block_id, created_at, id). No COUNT(*) runs
+    unless the client asks for it with ?with_count=1.
+    """
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    count_query_param = "with_count"
+    invalid_cursor_message = _("Invalid cursor")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.count = queryset.count() if request.query_params.get(self.count_query_param) in ("1", "true") else None
+
+        cursor = self.decode_cursor(request, queryset)
+        reverse = bool(cursor and cursor[2])
+        if cursor:
+            created_at, pk, _ = cursor
+            if reverse:
+                # Going back towards newer rows
+                queryset = queryset.filter(
+                    Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk),
+                    created_at__gte=created_at,
+                ).order_by("created_at", "pk")
+            else:
+                # The redundant created_at bound gives the index a range condition
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk),
+                    created_at__lte=created_at,
+                ).order_by("-created_at", "-pk")
+        else:
+            queryset = queryset.order_by("-created_at", "-pk")
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.page = rows
+        self.has_next = bool(rows) and (has_more if not reverse else True)
+        self.has_previous = bool(rows) and (has_more if reverse else bool(cursor))
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def decode_cursor(self, request, queryset):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            created_at, pk, reverse = json.loads(b64decode(encoded.encode(), altchars=b"-_"))
+            pk = queryset.model._meta.pk.to_python(pk)
+            if pk is None:
+                raise ValueError("empty pk")
+            return datetime.fromisoformat(created_at), pk, bool(reverse)
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message) from None
+
+    def encode_cursor(self, obj, reverse):
+        payload = json.dumps([obj.created_at.isoformat(), obj.pk, int(reverse)])
+        encoded = b64encode(payload.encode(), altchars=b"-_").decode()
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        return self.encode_cursor(self.page[-1], reverse=False) if self.has_next else None
+
+    def get_previous_link(self):
+        return self.encode_cursor(self.page[0], reverse=True) if self.has_previous else None
+
+    def get_paginated_response(self, data):
+        payload = {"next": self.get_next_link(), "previous": self.get_previous_link()}
+        if self.count is not None:
+            payload["count"] = self.count
+        payload["results"] = data
+        return Response(payload)
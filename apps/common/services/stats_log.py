@@ -0,0 +1,31 @@
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class StatsLogger:
+    """
+    Writes the stats() of an in-process cache to the log at most once per
+    `interval` seconds (0 disables it). The counters are per process, so
+    every line carries the pid; summing the latest line of each worker gives
+    the totals. tick() goes on the cache's lookup path and only reads the
+    clock until a line is due.
+    """
+
+    def __init__(self, name, source, interval):
+        self.name = name
+        self.source = source
+        self.interval = interval
+        self._next_at = time.monotonic() + interval
+
+    def tick(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if now < self._next_at:
+            return
+        self._next_at = now + self.interval
+        logger.info("%s stats pid=%s %s", self.name, os.getpid(), json.dumps(self.source.stats()))
@@ -0,0 +1,2 @@
+from .mail_dispatch import drain_mail_queue  # noqa
+from .send_mail_task import send_email_task  # noqa
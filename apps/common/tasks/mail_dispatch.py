@@ -0,0 +1,16 @@
+from celery import shared_task
+
+from apps.common.services.mail_dispatcher import MailDispatcher
+
+
+@shared_task
+def drain_mail_queue(max_batches=10):
+    """Send queued bulk email, one SMTP session per batch."""
+    sent = 0
+    for _ in range(max_batches):
+        result = MailDispatcher.drain()
+        sent += result["sent"]
+        # Stop when the queue is empty or only rate-limited mail is left
+        if not result["sent"] and not result["retried"]:
+            break
+    return sent
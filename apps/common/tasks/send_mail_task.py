@@ -1,12 +1,9 @@
 from celery import shared_task
-from django.core.mail import send_mail
+
+from apps.common.services.mail_dispatcher import MailDispatcher
+
 
 @shared_task
 def send_email_task(subject, message, from_email, recipient_list):
-    send_mail(
-        subject=subject,
-        message=message,
-        from_email=from_email,
-        recipient_list=recipient_list,
-        fail_silently=False,
-    )
+    """Queue a plain text email for the bulk dispatcher (drain_mail_queue)."""
+    MailDispatcher.enqueue(subject, message, recipient_list, from_email=from_email)
@@ -1,6 +1,23 @@
 from django.apps import AppConfig
+from django.db.models.signals import pre_migrate
+
+
+def create_pg_trgm_extension(sender, using, **kwargs):
+    """Trigram indexes on Item/Keyword need pg_trgm before their tables are built."""
+    from django.db import connections
+
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
 
 
 class ItemConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.item'
+
+    def ready(self):
+        from apps.item import signals  # noqa
+
+        pre_migrate.connect(create_pg_trgm_extension, sender=self)
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.item.models import Item
+from apps.item.services.search_document import update_search_document
+
+
+class Command(BaseCommand):
+    help = "Fill Item.search_document in small batches, one transaction per batch."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--only-missing",
+            action="store_true",
+            help="Skip items that already have a search document.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        queryset = Item.objects.order_by("pk")
+        if options["only_missing"]:
+            queryset = queryset.filter(search_document__isnull=True)
+
+        last_pk = 0
+        total = 0
+        while True:
+            ids = list(
+                queryset.filter(pk__gt=last_pk).values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+
+            with transaction.atomic():
+                total += update_search_document(ids)
+
+            last_pk = ids[-1]
+            self.stdout.write(f"Updated {total} items (last id {last_pk})")
+
+        self.stdout.write(self.style.SUCCESS(f"Done, {total} items updated."))
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.item.models import Item, Keyword
+from apps.item.services.search_index import search_index
+
+MODELS = {
+    "item": Item,
+    "keyword": Keyword,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the search_latin shadow columns in small batches, "
+        "one transaction per batch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--model",
+            choices=sorted(MODELS),
+            action="append",
+            help="Only backfill these models (default: all).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        for name in options["model"] or MODELS:
+            model = MODELS[name]
+            fields = ["pk", *model.search_source_fields]
+
+            last_pk = 0
+            total = 0
+            while True:
+                batch = list(
+                    model.objects.filter(pk__gt=last_pk).order_by("pk").only(*fields)[:batch_size]
+                )
+                if not batch:
+                    break
+
+                for obj in batch:
+                    obj.update_search_shadow()
+
+                with transaction.atomic():
+                    model.objects.bulk_update(batch, ["search_latin"])
+
+                total += len(batch)
+                last_pk = batch[-1].pk
+                self.stdout.write(f"{name}: updated {total} rows (last id {last_pk})")
+
+            self.stdout.write(self.style.SUCCESS(f"{name}: done, {total} rows updated."))
+
+        # bulk_update skips the signals; make every worker rebuild its keyword index
+        search_index.invalidate()
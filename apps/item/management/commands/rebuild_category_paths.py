@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.item.models import Category
+
+
+class Command(BaseCommand):
+    help = "Recompute Category.path and Category.level from the parent links."
+
+    def handle(self, *args, **options):
+        children = {}
+        for pk, parent_id in Category.objects.values_list("pk", "parent_id"):
+            children.setdefault(parent_id, []).append(pk)
+
+        paths = {}
+        stack = [(pk, "") for pk in children.get(None, ())]
+        while stack:
+            pk, parent_path = stack.pop()
+            paths[pk] = f"{parent_path}{pk}/"
+            stack.extend((child, paths[pk]) for child in children.get(pk, ()))
+
+        categories = list(Category.objects.only("pk", "path", "level"))
+        changed = []
+        for category in categories:
+            path = paths.get(category.pk)
+            if path is None:
+                self.stderr.write(f"category {category.pk}: not reachable from a root, skipped")
+                continue
+            level = path.count("/") - 1
+            if (category.path, category.level) != (path, level):
+                category.path, category.level = path, level
+                changed.append(category)
+
+        with transaction.atomic():
+            Category.objects.bulk_update(changed, ["path", "level"], batch_size=500)
+
+        self.stdout.write(self.style.SUCCESS(f"done, {len(changed)} categories updated."))
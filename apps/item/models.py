@@ -1,9 +1,14 @@
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import F, Max, Q, Value
+from django.db.models.functions import Concat, Substr
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 from rest_framework.exceptions import ValidationError
 
-from apps.common.models import SlugMixin, BaseModel
+from apps.common.models import SlugMixin, BaseModel, TransliteratedSearchMixin
 
 
 class Category(SlugMixin):
@@ -17,6 +22,10 @@ class Category(SlugMixin):
         related_name='children'
     )
     level = models.PositiveSmallIntegerField(default=0, editable=False)
+    # Materialized path: ids from the root down to this category, e.g. "1/5/12/"
+    path = models.CharField(max_length=255, blank=True, default='', editable=False)
+
+    max_level = 2
 
     class Meta:
         verbose_name = _("Category")
@@ -25,6 +34,7 @@ class Category(SlugMixin):
         indexes = [
             models.Index(fields=['parent', 'level']),
             models.Index(fields=['slug']),
+            models.Index(fields=['path'], name='category_path', opclasses=['varchar_pattern_ops']),
         ]
 
     def __str__(self):
@@ -47,10 +57,20 @@ class Category(SlugMixin):
 
     def clean(self):
         if self.parent:
-            if self.parent.level >= 2:
+            if self.parent.level >= self.max_level:
                 raise ValidationError(_("Category tree cannot be deeper than 3 levels"))
             if self.parent_id == self.pk:
                 raise ValidationError(_("Category cannot be its own parent"))
+            if self.pk and f'/{self.pk}/' in f'/{self.parent.path}':
+                raise ValidationError(_("Category cannot be moved under its own descendant"))
+
+        if self.pk and self.path and self._parent_path() != self._stored_parent_path():
+            # Re-parenting moves the whole subtree; keep it within max_level.
+            old_level = self.path.count('/') - 1
+            deepest = self.get_descendants_queryset().aggregate(deepest=Max('level'))['deepest']
+            new_level = self.parent.level + 1 if self.parent else 0
+            if deepest is not None and new_level + deepest - old_level > self.max_level:
+                raise ValidationError(_("Category tree cannot be deeper than 3 levels"))
 
     def save(self, *args, **kwargs):
         self.level = self.parent.level + 1 if self.parent else 0
@@ -60,6 +80,45 @@ class Category(SlugMixin):
 
         self.full_clean()
         super().save(*args, **kwargs)
+        self._update_path()
+
+    def _parent_path(self):
+        if not self.parent:
+            return ''
+        if self.parent.path:
+            return self.parent.path
+        # The parent has no path yet (see rebuild_category_paths): follow the
+        # parent links up to the first ancestor that has one
+        ancestor_ids = []
+        prefix = ''
+        pk = self.parent_id
+        while pk is not None and len(ancestor_ids) <= self.max_level:
+            parent_id, path = Category.objects.values_list('parent_id', 'path').get(pk=pk)
+            if path:
+                prefix = path
+                break
+            ancestor_ids.append(pk)
+            pk = parent_id
+        return prefix + ''.join(f'{ancestor_id}/' for ancestor_id in reversed(ancestor_ids))
+
+    def _stored_parent_path(self):
+        return self.path.rsplit('/', 2)[0] + '/' if self.path.count('/') > 1 else ''
+
+    def _update_path(self):
+        """Store this category's path and move its descendants along with it."""
+        old_path = self.path
+        new_path = f'{self._parent_path()}{self.pk}/'
+        if new_path == old_path:
+            return
+
+        Category.objects.filter(pk=self.pk).update(path=new_path)
+        if old_path:
+            level_shift = new_path.count('/') - old_path.count('/')
+            Category.objects.filter(path__startswith=old_path).exclude(pk=self.pk).update(
+                path=Concat(Value(new_path), Substr('path', len(old_path) + 1)),
+                level=F('level') + level_shift,
+            )
+        self.path = new_path
 
     def _title_changed(self):
         """Check if title has changed"""
@@ -71,22 +130,43 @@ class Category(SlugMixin):
         except Category.DoesNotExist:
             return True
 
+    def get_ancestor_ids(self):
+        """Ids of parent categories from root down, read from the path"""
+        return [int(pk) for pk in self.path.split('/')[:-2]]
+
     def get_ancestors(self):
         """Get all parent categories up to root"""
-        ancestors = []
-        current = self.parent
-        while current:
-            ancestors.append(current)
-            current = current.parent
-        return list(reversed(ancestors))
+        ancestor_ids = self.get_ancestor_ids()
+        if not ancestor_ids:
+            return []
+        ancestors = Category.objects.in_bulk(ancestor_ids)
+        return [ancestors[pk] for pk in ancestor_ids if pk in ancestors]
+
+    def get_descendants_queryset(self, include_self=False):
+        """All categories in this subtree, one indexed prefix query"""
+        if not self.path:
+            return Category.objects.none()
+        queryset = Category.objects.filter(path__startswith=self.path)
+        if not include_self:
+            queryset = queryset.exclude(pk=self.pk)
+        return queryset
+
+    def subtree_filter(self, lookup='category'):
+        """
+        Q for rows whose `lookup` category is this one or below it. Uses the
+        path prefix; while the path is not filled yet (see
+        rebuild_category_paths) it follows the parent links instead.
+        """
+        if self.path:
+            return Q(**{f'{lookup}__path__startswith': self.path})
+        condition = Q(**{f'{lookup}__pk': self.pk})
+        for depth in range(1, self.max_level + 1):
+            condition |= Q(**{f'{lookup}__{"parent__" * depth}pk': self.pk})
+        return condition
 
     def get_descendants(self):
         """Get all child categories recursively"""
-        descendants = []
-        for child in self.children.all():
-            descendants.append(child)
-            descendants.extend(child.get_descendants())
-        return descendants
+        return list(self.get_descendants_queryset().order_by('path'))
 
     @property
     def is_root(self):
@@ -94,21 +174,28 @@ class Category(SlugMixin):
 
     @property
     def is_leaf(self):
+        # CategoryService.with_counts() annotates child_count
+        child_count = getattr(self, 'child_count', None)
+        if child_count is not None:
+            return child_count == 0
         return not self.children.exists()
 
 
-class Keyword(models.Model):
+class Keyword(TransliteratedSearchMixin):
     name = models.CharField(max_length=255)
 
+    search_source_fields = ('name',)
+
     class Meta:
         verbose_name = _("Keyword")
         verbose_name_plural = _("Keywords")
+        indexes = TransliteratedSearchMixin.search_shadow_indexes('keyword')
 
     def __str__(self):
         return self.name
 
 
-class Item(SlugMixin):
+class Item(TransliteratedSearchMixin, SlugMixin):
     slug = models.SlugField()
     title = models.CharField(max_length=255, verbose_name=_("Title"))
     logo = models.URLField(
@@ -128,11 +215,18 @@ class Item(SlugMixin):
         null=True,
         verbose_name=_("Description")
     )
+    search_document = SearchVectorField(null=True, blank=True, editable=False)
+
+    search_source_fields = tuple(f'title_{lang}' for lang, _ in settings.LANGUAGES)
 
     class Meta:
         verbose_name = _("Item")
         verbose_name_plural = _("Items")
         ordering = ['title']
+        indexes = [
+            GinIndex(fields=['search_document']),
+            *TransliteratedSearchMixin.search_shadow_indexes('item'),
+        ]
 
     def __str__(self):
         return self.title
@@ -2,6 +2,7 @@ from django.utils.translation import get_language
 from rest_framework import serializers
 
 from apps.item.models import Category
+from apps.item.services.category import CategoryService
 
 
 class CategoryFlatSerializer(serializers.ModelSerializer):
@@ -12,6 +13,8 @@ class CategoryFlatSerializer(serializers.ModelSerializer):
     parent_title = serializers.SerializerMethodField()
     is_root = serializers.BooleanField(read_only=True)
     is_leaf = serializers.BooleanField(read_only=True)
+    child_count = serializers.SerializerMethodField()
+    item_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Category
@@ -23,7 +26,9 @@ class CategoryFlatSerializer(serializers.ModelSerializer):
             'parent_id',
             'parent_title',
             'is_root',
-            'is_leaf'
+            'is_leaf',
+            'child_count',
+            'item_count'
         ]
 
     def get_title(self, obj):
@@ -40,6 +45,13 @@ class CategoryFlatSerializer(serializers.ModelSerializer):
             return getattr(obj.parent, f'title_{lang}', obj.parent.title)
         return None
 
+    def get_child_count(self, obj):
+        # Annotated by CategoryService.with_counts()
+        return getattr(obj, 'child_count', None)
+
+    def get_item_count(self, obj):
+        return getattr(obj, 'item_count', None)
+
 
 class CategoryTreeSerializer(serializers.ModelSerializer):
     """Recursive tree serializer - shows nested children"""
@@ -115,9 +127,15 @@ class CategoryDetailSerializer(serializers.ModelSerializer):
         lang = self.context.get('language', get_language())
         return getattr(obj, f'slug_{lang}', obj.slug)
 
+    def _ancestors(self, obj):
+        # ancestors and breadcrumb share one query
+        if not hasattr(obj, '_ancestors'):
+            obj._ancestors = list(CategoryService.get_ancestors(obj))
+        return obj._ancestors
+
     def get_ancestors(self, obj):
         """Get all parent categories"""
-        ancestors = list(obj.get_ancestors())
+        ancestors = self._ancestors(obj)
         return CategoryFlatSerializer(
             ancestors,
             many=True,
@@ -127,7 +145,7 @@ class CategoryDetailSerializer(serializers.ModelSerializer):
     def get_breadcrumb(self, obj):
         """Get breadcrumb path as string"""
         lang = self.context.get('language', get_language())
-        ancestors = list(obj.get_ancestors())
+        ancestors = self._ancestors(obj)
         breadcrumb_items = [
             getattr(ancestor, f'title_{lang}', ancestor.title)
             for ancestor in ancestors
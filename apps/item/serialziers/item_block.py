@@ -35,7 +35,7 @@ class ItemBlockSerializer(LocalizedSerializerMixin, serializers.ModelSerializer)
         instance = {
             'id': instance.id,
             'title': instance.title,
-            'item': instance.item.id if instance.item else None,
+            'item': instance.item_id,
             "type": instance.type,
             "url": instance.url,
             "appstore": instance.appstore,
@@ -44,4 +44,10 @@ class ItemBlockSerializer(LocalizedSerializerMixin, serializers.ModelSerializer)
             "longitude": instance.longitude
         }
 
+        # Filled in by the views from apps.reaction.services.reaction_cache
+        flags = self.context.get('reaction_flags')
+        if flags is not None:
+            instance['is_liked'] = flags['liked'].get(instance['id'], False)
+            instance['is_bookmarked'] = flags['bookmarked'].get(instance['id'], False)
+
         return instance
\ No newline at end of file
@@ -0,0 +1,80 @@
+import json
+
+from django.db.models import Count, Prefetch
+from rest_framework.renderers import JSONRenderer
+
+from apps.item.models import ItemBlock, ItemKeyword
+from apps.item.serialziers.item import ItemSerializer
+from apps.item.serialziers.item_block import ItemBlockSerializer
+from apps.reaction.models import BlockStats, Review
+from apps.reaction.serializers.comments import CommentSerializer
+from apps.reaction.serializers.review import ReviewSerializer
+from apps.reaction.services.comment_thread import CommentThreadService
+
+COMMENTS_PREVIEW = 10
+COMMENT_REPLIES_PREVIEW = 3
+REVIEWS_PREVIEW = 5
+
+
+class BlockPageService:
+    @staticmethod
+    def get_block(block_id):
+        """The block with its item, category, keywords and stats in three queries."""
+        return ItemBlock.objects.select_related('item__category', 'stats').prefetch_related(
+            Prefetch('item__item_keywords', queryset=ItemKeyword.objects.select_related('keyword'))
+        ).get(pk=block_id)
+
+    @staticmethod
+    def get_stats(block):
+        try:
+            return block.stats
+        except BlockStats.DoesNotExist:
+            # Zeroed until the reconcile_block_stats task creates the row;
+            # a GET never writes
+            return BlockStats(block=block)
+
+    @staticmethod
+    def build(block_id):
+        """
+        Everything a block page shows that is the same for every user:
+        block, item with keywords, counters, the first comments and a review
+        summary, as plain JSON types (Decimals as numbers, string keys), so
+        a copy read back from the cache is identical to a fresh one. Raises
+        ItemBlock.DoesNotExist.
+        """
+        block = BlockPageService.get_block(block_id)
+        stats = BlockPageService.get_stats(block)
+
+        roots = list(
+            CommentThreadService.get_root_comments(block).order_by('-created_at', '-id')[:COMMENTS_PREVIEW + 1]
+        )
+        CommentThreadService.attach_replies(
+            roots[:COMMENTS_PREVIEW], max_depth=1, replies_limit=COMMENT_REPLIES_PREVIEW
+        )
+
+        reviews = Review.objects.filter(block=block).select_related('user').order_by('-created_at', '-id')
+        distribution = dict.fromkeys(range(6), 0)
+        distribution.update(
+            reviews.order_by().values_list('rating').annotate(total=Count('pk')).values_list('rating', 'total')
+        )
+
+        page = {
+            'block': ItemBlockSerializer(block).data,
+            'item': ItemSerializer(block.item).data,
+            'stats': {
+                'like_count': stats.like_count,
+                'view_count': stats.view_count,
+                'bookmark_count': stats.bookmark_count,
+                'review_count': stats.review_count,
+                'rating_average': round(stats.rating_average, 2),
+            },
+            'comments': {
+                'results': CommentSerializer(roots[:COMMENTS_PREVIEW], many=True).data,
+                'has_more': len(roots) > COMMENTS_PREVIEW,
+            },
+            'reviews': {
+                'rating_distribution': distribution,
+                'latest': ReviewSerializer(reviews[:REVIEWS_PREVIEW], many=True).data,
+            },
+        }
+        return json.loads(JSONRenderer().render(page))
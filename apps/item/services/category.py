@@ -1,10 +1,31 @@
-from django.db.models import Prefetch, Q
+from django.db.models import Count, OuterRef, Prefetch, Q, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.utils.translation import get_language
 
-from apps.item.models import Category
+from apps.item.models import Category, Item
 
 
 class CategoryService:
+    @staticmethod
+    def with_counts(queryset):
+        """
+        Annotate child_count and item_count with correlated subqueries, so
+        is_leaf and the counters need no query per row.
+        """
+        def count_of(model, field):
+            return Coalesce(Subquery(
+                model.objects.filter(**{field: OuterRef('pk')})
+                .order_by()
+                .values(field)
+                .annotate(total=Count('pk'))
+                .values('total')
+            ), Value(0))
+
+        return queryset.annotate(
+            child_count=count_of(Category, 'parent'),
+            item_count=count_of(Item, 'category'),
+        )
+
     @staticmethod
     def get_all_categories_flat(level=None, parent_id=None):
         """
@@ -31,10 +52,12 @@ class CategoryService:
         queryset = Category.objects.filter(parent=None).prefetch_related(
             Prefetch(
                 'children',
-                queryset=Category.objects.prefetch_related('children')
+                queryset=CategoryService.with_counts(Category.objects.all()).prefetch_related(
+                    Prefetch('children', queryset=CategoryService.with_counts(Category.objects.all()))
+                )
             )
         )
-        return queryset
+        return CategoryService.with_counts(queryset)
 
     @staticmethod
     def get_category_by_slug(slug):
@@ -46,6 +69,30 @@ class CategoryService:
         """
         return Category.objects.select_related('parent').get(slug=slug)
 
+    @staticmethod
+    def get_category_detail_queryset():
+        """Categories with parent and counted children, for the detail serializer"""
+        return CategoryService.with_counts(Category.objects.select_related('parent')).prefetch_related(
+            Prefetch(
+                'children',
+                queryset=CategoryService.with_counts(Category.objects.select_related('parent'))
+            )
+        )
+
+    @staticmethod
+    def get_children(category):
+        """Direct children of a category"""
+        return CategoryService.with_counts(
+            Category.objects.filter(parent=category).select_related('parent')
+        )
+
+    @staticmethod
+    def get_ancestors(category):
+        """Parent categories from root down, one query"""
+        return CategoryService.with_counts(
+            Category.objects.filter(pk__in=category.get_ancestor_ids()).select_related('parent')
+        ).order_by('level')
+
     @staticmethod
     def get_category_with_children(category_id):
         """Get category with all nested children"""
@@ -62,12 +109,14 @@ class CategoryService:
     def get_leaf_categories():
         """Get only leaf categories (categories without children)"""
 
-        return Category.objects.filter(children__isnull=True)
+        return CategoryService.with_counts(
+            Category.objects.filter(children__isnull=True).select_related('parent')
+        )
 
     @staticmethod
     def get_root_categories():
         """Get only root categories (top level)"""
-        return Category.objects.filter(parent=None)
+        return CategoryService.with_counts(Category.objects.filter(parent=None))
 
     @staticmethod
     def search_categories(query, language=None):
@@ -0,0 +1,99 @@
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+
+from apps.item.models import Category
+
+
+class CategoryTreeSnapshot:
+    """
+    Pre-rendered category tree, one JSON document per language.
+
+    The tree is built from a single flat values() query and rendered once.
+    Rendered documents are shared through the cache (Redis) and kept in a
+    process-local copy; both are keyed by a version stamp that Category
+    save/delete signals bump, so serving the tree runs no SQL until a
+    category changes.
+    """
+
+    VERSION_KEY = "item:category_tree:version"
+    SNAPSHOT_KEY = "item:category_tree:{version}:{language}"
+
+    def __init__(self, timeout=24 * 60 * 60):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._snapshots = {}
+
+    def get(self, language):
+        """Return (etag, JSON bytes) of the tree for `language`."""
+        language = self._resolve_language(language)
+        version = cache.get(self.VERSION_KEY, 0)
+
+        with self._lock:
+            snapshot = self._snapshots.get(language)
+        if snapshot is not None and snapshot[0] == version:
+            return snapshot[1], snapshot[2]
+
+        key = self.SNAPSHOT_KEY.format(version=version, language=language)
+        content = cache.get(key)
+        if content is None:
+            content = self.render(language)
+            cache.set(key, content, timeout=self.timeout)
+
+        body = content.encode()
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        with self._lock:
+            self._snapshots[language] = (version, etag, body)
+        return etag, body
+
+    def invalidate(self):
+        """Move every worker to a new version; old snapshots expire on their own."""
+        try:
+            cache.incr(self.VERSION_KEY)
+        except ValueError:
+            cache.add(self.VERSION_KEY, 0, timeout=None)
+            cache.incr(self.VERSION_KEY)
+
+    @staticmethod
+    def _resolve_language(language):
+        languages = [lang for lang, _ in settings.LANGUAGES]
+        return language if language in languages else settings.LANGUAGE_CODE
+
+    def render(self, language):
+        return JSONRenderer().render(self.build(language)).decode()
+
+    @staticmethod
+    def build(language):
+        """Nested tree in the shape of CategoryTreeSerializer."""
+        title_field = f"title_{language}"
+        rows = Category.objects.values("id", "parent_id", "slug", "level", title_field)
+
+        children = {}
+        for row in rows:
+            children.setdefault(row["parent_id"], []).append(row)
+
+        def title_key(row):
+            # Category.Meta.ordering, with NULL titles last as in PostgreSQL
+            return row["level"], row[title_field] is None, row[title_field] or ""
+
+        def node(row):
+            nested = [node(child) for child in sorted(children.get(row["id"], ()), key=title_key)]
+            return {
+                "id": row["id"],
+                "title": row[title_field],
+                "slug": row["slug"],
+                "level": row["level"],
+                "is_root": row["parent_id"] is None,
+                "is_leaf": not nested,
+                "children": nested,
+            }
+
+        return [node(row) for row in sorted(children.get(None, ()), key=title_key)]
+
+
+category_tree = CategoryTreeSnapshot(
+    timeout=getattr(settings, "CATEGORY_TREE_CACHE_TIMEOUT", 24 * 60 * 60),
+)
@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+from django.db.models import OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Coalesce
+
+from apps.item.models import Item, ItemKeyword
+
+SEARCH_CONFIG = "simple"
+
+# Titles rank above keywords, keywords above descriptions.
+SEARCH_WEIGHTS = {
+    "title": "A",
+    "keywords": "B",
+    "description": "C",
+}
+
+
+def build_search_document():
+    """
+    Expression that computes Item.search_document from the translated title and
+    description columns plus the names of all linked keywords.
+    """
+    languages = [lang for lang, _ in settings.LANGUAGES]
+    keyword_names = Subquery(
+        ItemKeyword.objects.filter(item=OuterRef("pk"))
+        .values("item")
+        .annotate(names=StringAgg("keyword__name", delimiter=" "))
+        .values("names")
+    )
+
+    return (
+        SearchVector(
+            *[f"title_{lang}" for lang in languages],
+            config=SEARCH_CONFIG,
+            weight=SEARCH_WEIGHTS["title"],
+        )
+        + SearchVector(
+            Coalesce(keyword_names, Value(""), output_field=TextField()),
+            config=SEARCH_CONFIG,
+            weight=SEARCH_WEIGHTS["keywords"],
+        )
+        + SearchVector(
+            *[f"description_{lang}" for lang in languages],
+            config=SEARCH_CONFIG,
+            weight=SEARCH_WEIGHTS["description"],
+        )
+    )
+
+
+def update_search_document(item_ids=None):
+    """
+    Recompute search_document for the given items (all items if None).
+    Runs as a single UPDATE, so no model signals are fired.
+    """
+    queryset = Item.objects.all()
+    if item_ids is not None:
+        queryset = queryset.filter(pk__in=item_ids)
+    return queryset.update(search_document=build_search_document())
@@ -0,0 +1,334 @@
+import json
+import threading
+from array import array
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+from apps.common.models import latin_search_normalizer
+from apps.item.models import Item, ItemKeyword, Keyword
+
+# Bump the version and append the change to the log, keeping its last
+# ARGV[2] entries. KEYS: version, log; ARGV: change, log size.
+PUBLISH_SCRIPT = """
+local version = redis.call('INCR', KEYS[1])
+redis.call('RPUSH', KEYS[2], version .. ' ' .. ARGV[1])
+redis.call('LTRIM', KEYS[2], -tonumber(ARGV[2]), -1)
+return version
+"""
+
+# The current version followed by the logged changes after version ARGV[1]
+# (fewer if the log was trimmed meanwhile). KEYS: version, log.
+READ_LOG_SCRIPT = """
+local version = tonumber(redis.call('GET', KEYS[1]) or '0')
+local behind = version - tonumber(ARGV[1])
+local entries = {}
+if behind > 0 then
+    entries = redis.call('LRANGE', KEYS[2], -behind, -1)
+end
+table.insert(entries, 1, tostring(version))
+return entries
+"""
+
+
+class KeywordSearchIndex:
+    """
+    Process-local inverted index used by ItemSearchView.
+
+    Holds keyword name -> keyword ids, keyword id -> sorted array of item ids,
+    the number of keyword links per item and titles per language, so that
+    ranking runs in memory and the database is only hit to hydrate the top
+    results. Names, titles and query tokens are all normalized to lower-case
+    latin (Keyword.search_latin), so cyrillic and latin spellings match.
+
+    Every worker keeps its own copy. Writes bump a version stamp in Redis
+    and append the change to a change log there; ensure_fresh(), called once
+    per search, replays the changes a worker has not seen yet. Only a worker
+    that never loaded, fell more than LOG_SIZE changes behind or saw
+    invalidate() reloads the whole index. Changes are idempotent, so
+    replaying one a worker already applied is harmless.
+    """
+
+    VERSION_KEY = "item:search_index:version"
+    LOG_KEY = "item:search_index:log"
+    LOG_SIZE = 10000
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        self._version = None
+        self._loaded = False
+        self._keyword_names = {}
+        self._name_to_keywords = {}
+        self._postings = {}
+        self._item_links = {}
+        self._pair_counts = {}
+        self._item_keyword_counts = {}
+        self._titles = {}
+
+    @staticmethod
+    def _redis():
+        return get_redis_connection("default")
+
+    # Building
+
+    def rebuild(self):
+        """
+        Load the whole index from Keyword / ItemKeyword / Item. Searches keep
+        using the previous copy until the new one is swapped in.
+        """
+        version = self._get_remote_version()
+
+        keyword_names = dict(Keyword.objects.values_list("id", "search_latin"))
+        name_to_keywords = {}
+        for keyword_id, name in keyword_names.items():
+            name_to_keywords.setdefault(name, set()).add(keyword_id)
+
+        postings = {}
+        item_links = {}
+        pair_counts = {}
+        item_keyword_counts = {}
+        links = ItemKeyword.objects.values_list("id", "keyword_id", "item_id")
+        for link_id, keyword_id, item_id in links.iterator():
+            postings.setdefault(keyword_id, set()).add(item_id)
+            item_links[link_id] = (keyword_id, item_id)
+            pair = (keyword_id, item_id)
+            pair_counts[pair] = pair_counts.get(pair, 0) + 1
+            item_keyword_counts[item_id] = item_keyword_counts.get(item_id, 0) + 1
+
+        title_fields = [f"title_{lang}" for lang, _ in settings.LANGUAGES]
+        titles = {}
+        for row in Item.objects.values("id", *title_fields).iterator():
+            titles[row["id"]] = self._normalize_titles(row)
+
+        with self._lock:
+            self._keyword_names = keyword_names
+            self._name_to_keywords = name_to_keywords
+            self._postings = {
+                keyword_id: array("q", sorted(item_ids))
+                for keyword_id, item_ids in postings.items()
+            }
+            self._item_links = item_links
+            self._pair_counts = pair_counts
+            self._item_keyword_counts = item_keyword_counts
+            self._titles = titles
+            self._version = version
+            self._loaded = True
+
+    def ensure_fresh(self):
+        """
+        Bring this worker's copy up to date: one GET when nothing changed,
+        replay of the change log otherwise, a full rebuild as a last resort.
+        Call it once per search, before match_keywords() and rank().
+        """
+        if self._loaded and self._get_remote_version() == self._version:
+            return
+        with self._sync_lock:
+            if not (self._loaded and self._catch_up()):
+                self.rebuild()
+
+    def _catch_up(self):
+        """Apply the logged changes after our version; False if the log cannot cover the gap."""
+        entries = self._redis().register_script(READ_LOG_SCRIPT)(
+            keys=[self.VERSION_KEY, self.LOG_KEY], args=[self._version]
+        )
+        remote = int(entries[0])
+        if remote < self._version:
+            # the version key was lost (e.g. Redis flushed)
+            return False
+
+        changes = []
+        for entry in entries[1:]:
+            version, change = entry.decode().split(" ", 1)
+            changes.append((int(version), json.loads(change)))
+        expected = list(range(self._version + 1, remote + 1))
+        if [version for version, _ in changes] != expected:
+            return False
+
+        with self._lock:
+            for version, (op, args) in changes:
+                if op == "invalidate":
+                    return False
+                getattr(self, f"_apply_{op}")(*args)
+                self._version = version
+        return True
+
+    @staticmethod
+    def _normalize_titles(row):
+        normalize = latin_search_normalizer.process
+        default = normalize(row.get(f"title_{settings.LANGUAGE_CODE}") or "")
+        return {
+            lang: normalize(row.get(f"title_{lang}") or "") or default
+            for lang, _ in settings.LANGUAGES
+        }
+
+    # Version stamp and change log
+
+    def _get_remote_version(self):
+        return int(self._redis().get(self.VERSION_KEY) or 0)
+
+    def _publish(self, op, *args):
+        """
+        Log a change for the other workers. If nobody else wrote since our
+        last sync the local copy is now at the new version; otherwise the
+        next ensure_fresh() replays what we missed (our own change included).
+        """
+        version = self._redis().register_script(PUBLISH_SCRIPT)(
+            keys=[self.VERSION_KEY, self.LOG_KEY],
+            args=[json.dumps([op, args]), self.LOG_SIZE],
+        )
+        with self._lock:
+            if self._version is not None and version == self._version + 1:
+                self._version = version
+
+    def _write(self, op, *args):
+        with self._lock:
+            if self._loaded:
+                getattr(self, f"_apply_{op}")(*args)
+        self._publish(op, *args)
+
+    def invalidate(self):
+        """Make every worker rebuild on its next search (after bulk writes)."""
+        with self._lock:
+            self._loaded = False
+        self._publish("invalidate")
+
+    # Incremental updates
+
+    def add_link(self, link_id, keyword_id, item_id):
+        self._write("add_link", link_id, keyword_id, item_id)
+
+    def remove_link(self, link_id):
+        self._write("remove_link", link_id)
+
+    def update_keyword(self, keyword_id, name):
+        self._write("update_keyword", keyword_id, name)
+
+    def remove_keyword(self, keyword_id):
+        self._write("remove_keyword", keyword_id)
+
+    def update_item(self, item):
+        titles = {
+            f"title_{lang}": getattr(item, f"title_{lang}", None)
+            for lang, _ in settings.LANGUAGES
+        }
+        self._write("update_item", item.pk, titles)
+
+    def remove_item(self, item_id):
+        self._write("remove_item", item_id)
+
+    def _apply_add_link(self, link_id, keyword_id, item_id):
+        previous = self._item_links.get(link_id)
+        if previous == (keyword_id, item_id):
+            return
+        if previous is not None:
+            self._apply_remove_link(link_id)
+        pair = (keyword_id, item_id)
+        self._item_links[link_id] = pair
+        self._pair_counts[pair] = self._pair_counts.get(pair, 0) + 1
+        self._item_keyword_counts[item_id] = self._item_keyword_counts.get(item_id, 0) + 1
+        if self._pair_counts[pair] == 1:
+            insort(self._postings.setdefault(keyword_id, array("q")), item_id)
+
+    def _apply_remove_link(self, link_id):
+        pair = self._item_links.pop(link_id, None)
+        if pair is None:
+            return
+        keyword_id, item_id = pair
+
+        remaining = self._item_keyword_counts.get(item_id, 0) - 1
+        if remaining > 0:
+            self._item_keyword_counts[item_id] = remaining
+        else:
+            self._item_keyword_counts.pop(item_id, None)
+
+        # Another link may still tie the same keyword to the same item.
+        remaining = self._pair_counts.get(pair, 0) - 1
+        if remaining > 0:
+            self._pair_counts[pair] = remaining
+            return
+        self._pair_counts.pop(pair, None)
+
+        item_ids = self._postings.get(keyword_id)
+        if item_ids is not None:
+            position = bisect_left(item_ids, item_id)
+            if position < len(item_ids) and item_ids[position] == item_id:
+                del item_ids[position]
+
+    def _apply_update_keyword(self, keyword_id, name):
+        self._discard_keyword_name(keyword_id)
+        self._keyword_names[keyword_id] = name
+        self._name_to_keywords.setdefault(name, set()).add(keyword_id)
+
+    def _apply_remove_keyword(self, keyword_id):
+        self._discard_keyword_name(keyword_id)
+        self._postings.pop(keyword_id, None)
+
+    def _discard_keyword_name(self, keyword_id):
+        old_name = self._keyword_names.pop(keyword_id, None)
+        if old_name is None:
+            return
+        keyword_ids = self._name_to_keywords.get(old_name)
+        if keyword_ids:
+            keyword_ids.discard(keyword_id)
+            if not keyword_ids:
+                del self._name_to_keywords[old_name]
+
+    def _apply_update_item(self, item_id, titles):
+        self._titles[item_id] = self._normalize_titles(titles)
+
+    def _apply_remove_item(self, item_id):
+        self._titles.pop(item_id, None)
+
+    # Querying
+
+    def match_keywords(self, tokens):
+        """Return (keyword ids, matched tokens) for the given tokens."""
+        keyword_ids = []
+        matched_names = set()
+        with self._lock:
+            for token in tokens:
+                ids = self._name_to_keywords.get(latin_search_normalizer.process(token))
+                if ids:
+                    keyword_ids.extend(sorted(ids))
+                    matched_names.add(token)
+        return keyword_ids, matched_names
+
+    def rank(self, tokens, keyword_ids, language, limit):
+        """
+        Rank items by relevance and return the ids of the top `limit`.
+
+        Ranking factors:
+        1. matched_terms_count: How many distinct matched keywords the item has
+        2. exact_title_match: Does the title contain one of the tokens
+        3. total_keywords: Total number of keywords (popularity signal)
+        """
+        fallback = settings.LANGUAGE_CODE
+        tokens = [latin_search_normalizer.process(token) for token in tokens]
+        ranked = []
+        with self._lock:
+            matched_counts = {}
+            for keyword_id in set(keyword_ids):
+                for item_id in self._postings.get(keyword_id, ()):
+                    matched_counts[item_id] = matched_counts.get(item_id, 0) + 1
+
+            for item_id, matched in matched_counts.items():
+                titles = self._titles.get(item_id)
+                if titles is None:
+                    continue
+                title = titles.get(language) or titles.get(fallback, "")
+                title_match = 1 if any(token in title for token in tokens) else 0
+                ranked.append((
+                    -matched,
+                    -title_match,
+                    -self._item_keyword_counts.get(item_id, 0),
+                    title,
+                    item_id,
+                ))
+
+        ranked.sort()
+        return [row[-1] for row in ranked[:limit]]
+
+
+search_index = KeywordSearchIndex()
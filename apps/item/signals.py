@@ -0,0 +1,70 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.item.models import Category, Item, ItemKeyword, Keyword
+from apps.item.services.category_tree import category_tree
+from apps.item.services.search_document import update_search_document
+from apps.item.services.search_index import search_index
+
+# Index updates run on commit so a rolled back request never leaks into the
+# index. Arguments are bound eagerly: Django clears the pk of deleted
+# instances before the commit callbacks run.
+
+
+@receiver(post_save, sender=ItemKeyword)
+def index_item_keyword_saved(sender, instance, **kwargs):
+    transaction.on_commit(
+        partial(search_index.add_link, instance.pk, instance.keyword_id, instance.item_id)
+    )
+
+
+@receiver(post_delete, sender=ItemKeyword)
+def index_item_keyword_deleted(sender, instance, **kwargs):
+    transaction.on_commit(partial(search_index.remove_link, instance.pk))
+
+
+@receiver(post_save, sender=Keyword)
+def index_keyword_saved(sender, instance, **kwargs):
+    transaction.on_commit(partial(search_index.update_keyword, instance.pk, instance.search_latin))
+
+
+@receiver(post_delete, sender=Keyword)
+def index_keyword_deleted(sender, instance, **kwargs):
+    transaction.on_commit(partial(search_index.remove_keyword, instance.pk))
+
+
+@receiver(post_save, sender=Item)
+def index_item_saved(sender, instance, **kwargs):
+    transaction.on_commit(partial(search_index.update_item, instance))
+
+
+@receiver(post_delete, sender=Item)
+def index_item_deleted(sender, instance, **kwargs):
+    transaction.on_commit(partial(search_index.remove_item, instance.pk))
+
+
+@receiver(post_save, sender=Item)
+def refresh_item_search_document(sender, instance, **kwargs):
+    transaction.on_commit(partial(update_search_document, [instance.pk]))
+
+
+@receiver(post_save, sender=ItemKeyword)
+@receiver(post_delete, sender=ItemKeyword)
+def refresh_item_keyword_search_document(sender, instance, **kwargs):
+    transaction.on_commit(partial(update_search_document, [instance.item_id]))
+
+
+@receiver(post_save, sender=Keyword)
+def refresh_keyword_search_document(sender, instance, **kwargs):
+    item_ids = list(instance.item_keywords.values_list("item_id", flat=True))
+    if item_ids:
+        transaction.on_commit(partial(update_search_document, item_ids))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_tree(sender, instance, **kwargs):
+    transaction.on_commit(category_tree.invalidate)
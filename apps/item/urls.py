@@ -32,6 +32,8 @@ urlpatterns = [
     # Item Block views
     path("itemblock/list/", views.ItemBlockListAPIView.as_view(), name="itemblock-list"),
     path("itemblock/detail/<int:id>/", views.ItemBlockDetailAPIView.as_view(), name="itemblock-detail"),
+    path("itemblock/trending/", views.ItemBlockTrendingAPIView.as_view(), name="itemblock-trending"),
+    path("itemblock/<int:id>/full/", views.ItemBlockFullAPIView.as_view(), name="itemblock-full"),
     path("itemblock/post/", views.ItemBlockCreateAPIView.as_view(), name="itemblock-create"),
     path("itemblock/update/<int:id>/", views.ItemBlockUpdateAPIView.as_view(), name="itemblock-update"),
     path("itemblock/delete/<int:id>/", views.ItemBlockDeleteAPIView.as_view(), name="itemblock-delete"),
@@ -1,3 +1,8 @@
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import method_decorator
+from django.utils.http import parse_etags
 from django.utils.translation import get_language
 from rest_framework import generics
 from rest_framework import status
@@ -6,8 +11,9 @@ from rest_framework.views import APIView
 
 from apps.common.services.paginator import StandardResultsSetPagination
 from apps.item.models import Category
-from apps.item.serialziers.category import CategoryFlatSerializer, CategoryDetailSerializer, CategoryTreeSerializer
+from apps.item.serialziers.category import CategoryFlatSerializer, CategoryDetailSerializer
 from apps.item.services.category import CategoryService
+from apps.item.services.category_tree import category_tree
 
 
 class CategoryListView(generics.ListAPIView):
@@ -19,7 +25,9 @@ class CategoryListView(generics.ListAPIView):
         return context
 
     def get_queryset(self):
-        queryset = Category.objects.select_related('parent').all().order_by('id')
+        queryset = CategoryService.with_counts(
+            Category.objects.select_related('parent')
+        ).order_by('id')
 
         level = self.request.query_params.get('level')
         if level is not None:
@@ -45,7 +53,7 @@ class CategoryListView(generics.ListAPIView):
 
 
 class CategoryDetailView(generics.RetrieveAPIView):
-    queryset = Category.objects.select_related('parent').prefetch_related('children')
+    queryset = CategoryService.get_category_detail_queryset()
     serializer_class = CategoryDetailSerializer
 
     def get_serializer_context(self):
@@ -54,16 +62,24 @@ class CategoryDetailView(generics.RetrieveAPIView):
         return context
 
 
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
 class CategoryTreeView(APIView):
+    """
+    Full category tree, served from the pre-rendered snapshot
+    (see apps.item.services.category_tree). Supports If-None-Match.
+    """
 
     def get(self, request):
-        categories = CategoryService.get_category_tree()
-        serializer = CategoryTreeSerializer(
-            categories,
-            many=True,
-            context={'language': get_language(), 'request': request}
-        )
-        return Response(serializer.data)
+        etag, body = category_tree.get(get_language())
+
+        if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+        if etag in if_none_match or '*' in if_none_match:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = etag
+        patch_vary_headers(response, ['Accept-Language', 'Cookie'])
+        return response
 
 
 class CategoryRootsView(generics.ListAPIView):
@@ -94,7 +110,7 @@ class CategoryBySlugView(APIView):
 
     def get(self, request, slug):
         try:
-            category = CategoryService.get_category_by_slug(slug)
+            category = CategoryService.get_category_detail_queryset().get(slug=slug)
             serializer = CategoryDetailSerializer(
                 category,
                 context={'language': get_language(), 'request': request}
@@ -114,7 +130,7 @@ class CategoryChildrenView(generics.ListAPIView):
     def get_queryset(self):
         slug = self.kwargs.get('slug')
         category = CategoryService.get_category_by_slug(slug)
-        return category.children.all()
+        return CategoryService.get_children(category)
 
     def get_serializer_context(self):
         ctx = super().get_serializer_context()
@@ -129,7 +145,7 @@ class CategoryAncestorsView(generics.ListAPIView):
     def get_queryset(self):
         slug = self.kwargs.get('slug')
         category = CategoryService.get_category_by_slug(slug)
-        return category.get_ancestors()
+        return CategoryService.get_ancestors(category)
 
     def get_serializer_context(self):
         ctx = super().get_serializer_context()
@@ -5,7 +5,7 @@ from rest_framework import permissions, status
 from rest_framework.generics import UpdateAPIView, DestroyAPIView, ListAPIView, CreateAPIView, RetrieveAPIView
 from rest_framework.response import Response
 
-from apps.item.models import Item
+from apps.item.models import Category, Item
 from apps.item.serialziers.item import ItemSerializer
 
 
@@ -78,6 +78,15 @@ class ItemListAPIView(ListAPIView):
             )
             queryset = queryset.filter(base_filter).distinct()
 
+        category_id = self.request.query_params.get('category')
+        if category_id:
+            try:
+                category = Category.objects.only('path').get(pk=int(category_id))
+            except (ValueError, Category.DoesNotExist):
+                return queryset.none()
+            # items of the category and all of its descendants
+            queryset = queryset.filter(category.subtree_filter())
+
         return queryset
 
     @swagger_auto_schema(
@@ -93,6 +102,12 @@ class ItemListAPIView(ListAPIView):
                 openapi.IN_QUERY,
                 description="Поиск по title и keyword",
                 type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'category',
+                openapi.IN_QUERY,
+                description="ID категории (включая подкатегории)",
+                type=openapi.TYPE_INTEGER
             )
         ]
     )
@@ -1,9 +1,20 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import Http404
+from django.utils.decorators import method_decorator
+from django.utils.translation import get_language
 from rest_framework import permissions, status
 from rest_framework.generics import UpdateAPIView, DestroyAPIView, ListAPIView, CreateAPIView, RetrieveAPIView
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
 from apps.item.models import  ItemBlock
 from apps.item.serialziers.item_block import ItemBlockSerializer
+from apps.item.services.block_page import BlockPageService
+from apps.reaction.services.leaderboard import BOARDS, LeaderboardService
+from apps.reaction.services.reaction_cache import get_reaction_flags
+from apps.reaction.services.reaction_state import ReactionStateService
 
 
 class ItemBlockListAPIView(ListAPIView):
@@ -12,7 +23,10 @@ class ItemBlockListAPIView(ListAPIView):
     permission_classes = []
 
     def get(self, request, *args, **kwargs):
-        serializer = self.get_serializer(self.get_queryset(), many=True)
+        blocks = list(self.get_queryset())
+        context = self.get_serializer_context()
+        context['reaction_flags'] = get_reaction_flags(request.user, [block.id for block in blocks])
+        serializer = self.get_serializer_class()(blocks, many=True, context=context)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -28,6 +42,71 @@ class ItemBlockDetailAPIView(RetrieveAPIView):
         item_id = self.kwargs.get('id')
         return ItemBlock.objects.filter(id=item_id)
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['reaction_flags'] = get_reaction_flags(self.request.user, [self.kwargs.get('id')])
+        return context
+
+
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
+class ItemBlockFullAPIView(APIView):
+    """
+    Block sahifasi uchun hamma narsa bitta javobda: block, item va keyword'lar,
+    statistika, birinchi izohlar va sharhlar xulosasi. Anonim foydalanuvchilar
+    uchun javob til bo'yicha keshlanadi.
+    """
+    permission_classes = []
+
+    def get(self, request, id, *args, **kwargs):
+        cache_key = f"itemblock:full:{id}:{get_language()}"
+        anonymous = not request.user.is_authenticated
+
+        data = cache.get(cache_key) if anonymous else None
+        if data is None:
+            try:
+                data = BlockPageService.build(id)
+            except ItemBlock.DoesNotExist:
+                raise Http404
+            if anonymous:
+                cache.set(cache_key, data, timeout=settings.ITEMBLOCK_FULL_CACHE_TIMEOUT)
+
+        if not anonymous:
+            data['my_reaction'] = ReactionStateService.get_states(request.user, [id])[0]
+        return Response(data, status=status.HTTP_200_OK)
+
+
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
+class ItemBlockTrendingAPIView(APIView):
+    """
+    Eng mashhur block'lar reytingi (?board=trending|top_rated, ?category=,
+    ?limit=). Ballar compute_leaderboards task'i tomonidan oldindan
+    hisoblanadi, bu yerda faqat Redis'dan o'qiladi.
+    """
+    permission_classes = []
+
+    def get(self, request, *args, **kwargs):
+        board = request.query_params.get('board', 'trending')
+        if board not in BOARDS:
+            return Response({"detail": f"board must be one of: {', '.join(BOARDS)}"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            category_id = request.query_params.get('category')
+            category_id = int(category_id) if category_id else None
+            limit = min(int(request.query_params.get('limit', 20)), settings.LEADERBOARD_SIZE)
+        except ValueError:
+            return Response({"detail": "category and limit must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+
+        top = LeaderboardService.get_top(board, category_id, max(limit, 1))
+        blocks = ItemBlock.objects.in_bulk([block_id for block_id, _ in top])
+        ranked = [(blocks[block_id], score) for block_id, score in top if block_id in blocks]
+
+        context = {'request': request, 'reaction_flags': get_reaction_flags(request.user, [b.id for b, _ in ranked])}
+        data = []
+        for block, score in ranked:
+            row = ItemBlockSerializer(block, context=context).data
+            row['score'] = score
+            data.append(row)
+        return Response(data, status=status.HTTP_200_OK)
+
 
 class ItemBlockCreateAPIView(CreateAPIView):
     queryset = ItemBlock.objects.all()
@@ -1,14 +1,24 @@
+import math
+import operator
 import re
-
-from django.db.models import Count, Q, Case, When, IntegerField, Value
-from django.utils.translation import gettext_lazy as _
+from functools import reduce
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity, TrigramWordSimilarity
+from django.db import connection, transaction
+from django.db.models import F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils.translation import get_language, gettext_lazy as _
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 # from apps.common.services.classifier.model_loader import classifier
-from apps.item.models import Keyword, Item
+from apps.common.models import latin_search_normalizer
+from apps.item.models import Item, ItemKeyword, Keyword
 from apps.item.serialziers.item import ItemSerializer
+from apps.item.services.search_document import SEARCH_CONFIG
+from apps.item.services.search_index import search_index
 
 
 class ItemSearchView(APIView):
@@ -18,6 +28,9 @@ class ItemSearchView(APIView):
     Query params:
         q: search query string
         limit: max results (default: 20)
+        fuzzy: 1 to match titles and keywords by trigram similarity (typos)
+        similarity: fuzzy match threshold, ITEM_SEARCH_TRIGRAM_MIN_THRESHOLD..1
+            (default: settings.ITEM_SEARCH_TRIGRAM_THRESHOLD)
     """
 
     STOPWORDS = {
@@ -44,12 +57,21 @@ class ItemSearchView(APIView):
                 status=status.HTTP_200_OK
             )
 
-        matching_keywords = Keyword.objects.filter(
-            name__in=tokens
-        ).values_list('id', 'name')
-
-        keyword_ids = [kw[0] for kw in matching_keywords]
-        matched_token_names = {kw[1] for kw in matching_keywords}
+        if request.query_params.get('fuzzy') in ('1', 'true'):
+            items = self._fuzzy_search_items(
+                query, tokens, self._get_similarity_threshold(request), limit
+            )
+            serializer = ItemSerializer(items, many=True)
+            return Response({
+                "results": serializer.data,
+                "query": query,
+                "tokens": tokens,
+                "fuzzy": True,
+                "total_results": len(items)
+            })
+
+        search_index.ensure_fresh()
+        keyword_ids, matched_token_names = search_index.match_keywords(tokens)
 
         if not keyword_ids:
             return Response(
@@ -107,74 +129,101 @@ class ItemSearchView(APIView):
 
     def _search_and_rank_items(self, tokens, keyword_ids, matched_token_names, limit):
         """
-        Search items and rank by relevance.
+        Rank items in memory with the keyword index and hydrate the top ones.
 
         Ranking factors:
         1. matched_terms_count: How many distinct query tokens matched
         2. exact_title_match: Does the title contain the exact query
         3. total_keywords: Total number of keywords (popularity signal)
         """
+        item_ids = search_index.rank(tokens, keyword_ids, get_language(), limit)
 
-        items_qs = Item.objects.filter(
-            item_keywords__keyword_id__in=keyword_ids
-        ).distinct()
+        items = Item.objects.filter(id__in=item_ids).prefetch_related(
+            'item_keywords__keyword'
+        )
+        items_by_id = {item.id: item for item in items}
 
-        matched_terms_annotations = {}
-        for i, kw_id in enumerate(keyword_ids):
-            matched_terms_annotations[f'has_kw_{i}'] = Case(
-                When(item_keywords__keyword_id=kw_id, then=Value(1)),
-                default=Value(0),
-                output_field=IntegerField()
-            )
+        return [items_by_id[item_id] for item_id in item_ids if item_id in items_by_id]
 
-        items_qs = items_qs.annotate(**matched_terms_annotations)
+    @staticmethod
+    def _get_similarity_threshold(request):
+        try:
+            threshold = float(request.query_params['similarity'])
+        except (KeyError, ValueError):
+            return settings.ITEM_SEARCH_TRIGRAM_THRESHOLD
+        if math.isnan(threshold):
+            return settings.ITEM_SEARCH_TRIGRAM_THRESHOLD
+        return min(max(threshold, settings.ITEM_SEARCH_TRIGRAM_MIN_THRESHOLD), 1.0)
 
-        matched_count_sum = sum([
-            f'has_kw_{i}' for i in range(len(keyword_ids))
-        ], Value(0))
+    def _fuzzy_search_items(self, query, tokens, threshold, limit):
+        """
+        Typo-tolerant search backed by the pg_trgm GIN indexes.
+
+        Candidates come from the `%>` operator for items and `%` for keywords
+        (trigram_word_similar / trigram_similar lookups), which the indexes on
+        Item.search_latin and Keyword.search_latin can serve; only the
+        candidates are then scored and ordered. Item.search_latin joins the
+        titles of all languages, so items are scored with word_similarity():
+        the best matching stretch of that text, not the whole of it. Query and
+        tokens are normalized to latin first, so a cyrillic query finds latin
+        titles and vice versa.
+        """
+        query = latin_search_normalizer.process(query)
+        tokens = [latin_search_normalizer.process(token) for token in tokens]
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            # `%` and `%>` compare against these settings; scope them to the transaction.
+            cursor.execute(
+                "SELECT set_config('pg_trgm.similarity_threshold', %s, true), "
+                "set_config('pg_trgm.word_similarity_threshold', %s, true)",
+                [str(threshold), str(threshold)]
+            )
 
-        items_qs = items_qs.annotate(
-            matched_terms_count=Count('item_keywords__keyword', distinct=True,
-                                      filter=Q(item_keywords__keyword_id__in=keyword_ids))
-        )
+            keyword_filter = reduce(operator.or_, [
+                Q(search_latin__trigram_similar=token) for token in tokens
+            ])
 
-        title_match_conditions = []
-        for token in tokens:
-            title_match_conditions.append(
-                When(title__icontains=token, then=Value(1))
+            candidate_ids = set(
+                Item.objects.filter(search_latin__trigram_word_similar=query).order_by().values_list('id', flat=True)
             )
-
-        items_qs = items_qs.annotate(
-            exact_title_match=Case(
-                *title_match_conditions,
-                default=Value(0),
-                output_field=IntegerField()
+            candidate_ids.update(
+                ItemKeyword.objects.filter(
+                    keyword__in=Keyword.objects.filter(keyword_filter)
+                ).values_list('item_id', flat=True)
             )
-        )
 
-        items_qs = items_qs.annotate(
-            total_keywords_count=Count('item_keywords', distinct=True)
-        )
+            if not candidate_ids:
+                return []
 
-        items_qs = items_qs.order_by(
-            '-matched_terms_count',
-            '-exact_title_match',
-            '-total_keywords_count',
-            'title'
-        )
+            keyword_similarity = Subquery(
+                Keyword.objects.filter(item_keywords__item=OuterRef('pk'))
+                .annotate(similarity=TrigramSimilarity('search_latin', query))
+                .order_by('-similarity')
+                .values('similarity')[:1]
+            )
 
-        return items_qs[:limit]
+            items = Item.objects.filter(id__in=candidate_ids).annotate(
+                similarity=Greatest(
+                    TrigramWordSimilarity(query, 'search_latin'),
+                    Coalesce(keyword_similarity, Value(0.0))
+                )
+            ).order_by('-similarity', 'title').prefetch_related(
+                'item_keywords__keyword'
+            )[:limit]
+
+            return list(items)
 
 
 class ItemSearchViewPostgreSQL(APIView):
     """
     Advanced search using PostgreSQL Full-Text Search.
     Requires PostgreSQL database.
+
+    Queries the stored, GIN-indexed Item.search_document
+    (see apps.item.services.search_document).
     """
 
     def get(self, request):
-        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
-
         query = request.query_params.get('q', '').strip()
         limit = int(request.query_params.get('limit', 20))
 
@@ -184,19 +233,13 @@ class ItemSearchViewPostgreSQL(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        search_vector = (
-                SearchVector('title', weight='A') +
-                SearchVector('item_keywords__keyword__name', weight='B')
-        )
-
-        search_query = SearchQuery(query)
+        search_query = SearchQuery(query, config=SEARCH_CONFIG)
 
-        items = Item.objects.annotate(
-            search=search_vector,
-            rank=SearchRank(search_vector, search_query)
-        ).filter(
-            search=search_query
-        ).order_by('-rank')[:limit]
+        items = Item.objects.filter(
+            search_document=search_query
+        ).annotate(
+            rank=SearchRank(F('search_document'), search_query, cover_density=True)
+        ).order_by('-rank').prefetch_related('item_keywords__keyword')[:limit]
 
         serializer = ItemSerializer(items, many=True)
 
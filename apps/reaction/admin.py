@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Comment, SearchHistory, View, Like, Review, Bookmark
+from .models import Comment, SearchHistory, View, Like, Review, Bookmark, BlockStats, BlockScore
 
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
@@ -36,4 +36,16 @@ class ReviewAdmin(admin.ModelAdmin):
 @admin.register(Bookmark)
 class BookmarkAdmin(admin.ModelAdmin):
     list_display = ("id", "block__title",)
-    list_display_links = ("id",)
\ No newline at end of file
+    list_display_links = ("id",)
+
+
+@admin.register(BlockStats)
+class BlockStatsAdmin(admin.ModelAdmin):
+    list_display = ("block", "like_count", "view_count", "bookmark_count", "review_count", "rating_sum")
+    readonly_fields = ("like_count", "view_count", "bookmark_count", "review_count", "rating_sum")
+
+
+@admin.register(BlockScore)
+class BlockScoreAdmin(admin.ModelAdmin):
+    list_display = ("block", "trending_score", "rating_score", "computed_at")
+    readonly_fields = ("trending_score", "rating_score", "computed_at")
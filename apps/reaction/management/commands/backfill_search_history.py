@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand
+from django.db import IntegrityError, transaction
+
+from apps.reaction.models import SearchHistory
+
+MAX_ATTEMPTS = 3
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill SearchHistory.normalized_query on rows written before it existed and merge "
+        "repeated searches into one row per (user, normalized query, block), summing hit_count. "
+        "Runs one transaction per batch of users."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100, help="Users per transaction.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        user_ids = list(
+            SearchHistory.objects.filter(normalized_query="")
+            .order_by("user_id").values_list("user_id", flat=True).distinct()
+        )
+
+        merged = kept = 0
+        for start in range(0, len(user_ids), batch_size):
+            users = user_ids[start:start + batch_size]
+            for attempt in range(1, MAX_ATTEMPTS + 1):
+                try:
+                    batch_kept, batch_merged = self.merge_users(users)
+                    break
+                except IntegrityError:
+                    # A search recorded meanwhile took one of the keys; reread and merge it too
+                    if attempt == MAX_ATTEMPTS:
+                        raise
+            kept += batch_kept
+            merged += batch_merged
+            self.stdout.write(f"{start + len(users)}/{len(user_ids)} users: {kept} kept, {merged} merged")
+
+        self.stdout.write(self.style.SUCCESS(f"done, {kept} rows kept, {merged} duplicates merged."))
+
+    @staticmethod
+    def merge_users(users):
+        with transaction.atomic():
+            rows = (
+                SearchHistory.objects.select_for_update()
+                .filter(user_id__in=users)
+                .order_by("-created_at", "-id")
+                .only("pk", "user_id", "block_id", "query", "normalized_query", "hit_count", "created_at")
+            )
+            keepers = {}
+            duplicates = []
+            for row in rows:
+                normalized = row.normalized_query or SearchHistory.normalize_query(row.query)
+                key = (row.user_id, normalized, row.block_id)
+                keeper = keepers.get(key)
+                if keeper is None:
+                    # the newest row of the group stays
+                    row.normalized_query = normalized
+                    keepers[key] = row
+                else:
+                    keeper.hit_count += row.hit_count
+                    duplicates.append(row.pk)
+
+            SearchHistory.objects.filter(pk__in=duplicates).delete()
+            SearchHistory.objects.bulk_update(keepers.values(), ["normalized_query", "hit_count"], batch_size=500)
+        return len(keepers), len(duplicates)
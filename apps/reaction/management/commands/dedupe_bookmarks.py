@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from apps.item.models import ItemBlock
+from apps.reaction.models import Bookmark
+from apps.reaction.services.block_stats import BlockStatsService
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete repeated bookmarks, keeping the oldest row per (user, block), and recount the "
+        "bookmark_count of the blocks involved. Run it before the migration that adds the "
+        "unique (user, block) constraint. One transaction per batch of duplicate pairs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Duplicate (user, block) pairs per transaction.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        pairs = list(
+            Bookmark.objects.order_by().values_list("user_id", "block_id")
+            .annotate(total=Count("pk")).filter(total__gt=1).values_list("user_id", "block_id")
+        )
+
+        deleted = 0
+        for start in range(0, len(pairs), batch_size):
+            batch = pairs[start:start + batch_size]
+            deleted += self.dedupe(batch)
+            self.stdout.write(f"{start + len(batch)}/{len(pairs)} pairs: {deleted} duplicates deleted")
+
+        self.stdout.write(self.style.SUCCESS(f"done, {deleted} duplicate bookmarks deleted."))
+
+    @staticmethod
+    def dedupe(pairs):
+        users = {user_id for user_id, _ in pairs}
+        blocks = {block_id for _, block_id in pairs}
+        wanted = set(pairs)
+        with transaction.atomic():
+            rows = (
+                Bookmark.objects.select_for_update()
+                .filter(user_id__in=users, block_id__in=blocks)
+                .order_by("created_at", "id")
+                .values_list("pk", "user_id", "block_id")
+            )
+            seen = set()
+            duplicates = []
+            for pk, user_id, block_id in rows:
+                key = (user_id, block_id)
+                if key not in wanted:
+                    continue
+                if key in seen:
+                    duplicates.append(pk)
+                else:
+                    # the oldest bookmark of the pair stays
+                    seen.add(key)
+
+            Bookmark.objects.filter(pk__in=duplicates).delete()
+            BlockStatsService.reconcile(ItemBlock.objects.filter(pk__in=blocks))
+        return len(duplicates)
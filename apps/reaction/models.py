@@ -2,7 +2,7 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
-from apps.common.models import BaseModel
+from apps.common.models import BaseModel, latin_search_normalizer
 from apps.item.models import Item, ItemBlock
 from apps.users.models import User
 
@@ -16,6 +16,9 @@ class Comment(BaseModel):
     class Meta:
         verbose_name = _("Comment")
         verbose_name_plural = _("Comments")
+        indexes = [
+            models.Index(fields=['block', 'created_at', 'id']),
+        ]
 
     def __str__(self):
         return self.text
@@ -37,11 +40,41 @@ class SearchHistory(BaseModel):
         on_delete=models.CASCADE,
         verbose_name=_("Clicked Item Block")
     )
+    # Repeated searches update one row (see SearchHistoryService.record).
+    # Empty only on rows written before the field existed, until
+    # `manage.py backfill_search_history` fills and merges them.
+    normalized_query = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        editable=False,
+        verbose_name=_("Normalized Query")
+    )
+    hit_count = models.PositiveIntegerField(default=1, verbose_name=_("Hits"))
 
     class Meta:
         verbose_name = _("Search History")
         verbose_name_plural = _("Search Histories")
         ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'normalized_query', 'block'],
+                condition=~models.Q(normalized_query=''),
+                name='searchhistory_user_query_block',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id']),
+        ]
+
+    @staticmethod
+    def normalize_query(query):
+        """Single-spaced, lowercased Latin form of `query`."""
+        return latin_search_normalizer.process(" ".join(query.split()))[:255]
+
+    def save(self, *args, **kwargs):
+        self.normalized_query = self.normalize_query(self.query)
+        super().save(*args, **kwargs)
 
 
 class View(BaseModel):
@@ -76,6 +109,9 @@ class Review(BaseModel):
         verbose_name_plural = _("Reviews")
 
         unique_together = ('user', 'block')
+        indexes = [
+            models.Index(fields=['block', 'created_at', 'id']),
+        ]
 
     def __str__(self):
         return self.text or f"Review by {self.user}"
@@ -88,3 +124,65 @@ class Bookmark(BaseModel):
     class Meta:
         verbose_name = _("Bookmark")
         verbose_name_plural = _("Bookmarks")
+
+        # Existing duplicates: run `manage.py dedupe_bookmarks` before migrating
+        unique_together = ('user', 'block')
+        indexes = [
+            models.Index(fields=['user', 'created_at', 'id']),
+        ]
+
+
+class BlockStats(models.Model):
+    """
+    Denormalized engagement counters of a block, kept up to date with F()
+    increments by the reaction views (see BlockStatsService) and corrected
+    periodically by the reconcile_block_stats task.
+    """
+    block = models.OneToOneField(
+        ItemBlock,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+        verbose_name=_("Block")
+    )
+    like_count = models.PositiveIntegerField(default=0, verbose_name=_("Likes"))
+    view_count = models.PositiveIntegerField(default=0, verbose_name=_("Views"))
+    bookmark_count = models.PositiveIntegerField(default=0, verbose_name=_("Bookmarks"))
+    review_count = models.PositiveIntegerField(default=0, verbose_name=_("Reviews"))
+    rating_sum = models.PositiveIntegerField(default=0, verbose_name=_("Rating sum"))
+
+    class Meta:
+        verbose_name = _("Block Stats")
+        verbose_name_plural = _("Block Stats")
+
+    def __str__(self):
+        return f"Stats of {self.block_id}"
+
+    @property
+    def rating_average(self):
+        return self.rating_sum / self.review_count if self.review_count else 0
+
+
+class BlockScore(models.Model):
+    """
+    Last computed leaderboard scores of a block (see LeaderboardService).
+    The rankings are served from Redis sorted sets; this table is the
+    durable snapshot they fall back to.
+    """
+    block = models.OneToOneField(
+        ItemBlock,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="score",
+        verbose_name=_("Block")
+    )
+    trending_score = models.FloatField(default=0, db_index=True, verbose_name=_("Trending score"))
+    rating_score = models.FloatField(default=0, db_index=True, verbose_name=_("Rating score"))
+    computed_at = models.DateTimeField(verbose_name=_("Computed at"))
+
+    class Meta:
+        verbose_name = _("Block Score")
+        verbose_name_plural = _("Block Scores")
+
+    def __str__(self):
+        return f"Score of {self.block_id}"
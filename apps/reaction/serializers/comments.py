@@ -2,19 +2,10 @@ from rest_framework import serializers
 from apps.reaction.models import Comment
 
 
-class RecursiveField(serializers.Serializer):
-    """
-    Rekursiv (nested) serializer — izoh ichidagi javoblarni ko‘rsatadi.
-    """
-    def to_representation(self, value):
-        # value = child comment instance
-        serializer = self.parent.parent.__class__(value, context=self.context)
-        return serializer.data
-
-
 class CommentSerializer(serializers.ModelSerializer):
     user = serializers.ReadOnlyField(source='user.username')
-    replies = RecursiveField(many=True, read_only=True, source='children')
+    replies = serializers.SerializerMethodField()
+    reply_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Comment
@@ -25,6 +16,23 @@ class CommentSerializer(serializers.ModelSerializer):
             'parent',
             'block',
             'replies',
+            'reply_count',
             'created_at',
         ]
         read_only_fields = ['user', 'block']
+
+    def _replies(self, obj):
+        # Filled in by CommentThreadService; otherwise fall back to a query
+        if not hasattr(obj, 'thread_replies'):
+            obj.thread_replies = list(obj.children.select_related('user').order_by('created_at', 'id'))
+        return obj.thread_replies
+
+    def get_replies(self, obj):
+        """
+        Rekursiv (nested) — izoh ichidagi javoblarni ko‘rsatadi.
+        """
+        return CommentSerializer(self._replies(obj), many=True, context=self.context).data
+
+    def get_reply_count(self, obj):
+        reply_count = getattr(obj, 'reply_count', None)
+        return reply_count if reply_count is not None else len(self._replies(obj))
@@ -0,0 +1,18 @@
+from rest_framework import serializers
+
+MAX_BLOCK_IDS = 500
+
+
+class ReactionStateRequestSerializer(serializers.Serializer):
+    block_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_BLOCK_IDS,
+    )
+
+
+class ReactionStateSerializer(serializers.Serializer):
+    block = serializers.IntegerField()
+    liked = serializers.BooleanField()
+    bookmarked = serializers.BooleanField()
+    my_rating = serializers.IntegerField(allow_null=True)
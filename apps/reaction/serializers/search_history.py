@@ -26,12 +26,5 @@ class SearchHistorySerializer(serializers.ModelSerializer):
 
     class Meta:
         model = SearchHistory
-        fields = ['id', 'user', 'query', 'block', 'block_id', 'created_at']
-
-    def create(self, validated_data):
-        """POST orqali yangi yozuv yaratish."""
-        user = self.context['request'].user
-        block_id = validated_data.pop('block_id')
-        block = ItemBlock.objects.get(pk=block_id)
-        history = SearchHistory.objects.create(user=user, block=block, **validated_data)
-        return history
+        fields = ['id', 'user', 'query', 'block', 'block_id', 'hit_count', 'created_at']
+        read_only_fields = ['hit_count']
@@ -0,0 +1,66 @@
+from django.db.models import Count, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from apps.item.models import ItemBlock
+from apps.reaction.models import BlockStats, Bookmark, Like, Review, View
+
+COUNTER_FIELDS = ["like_count", "view_count", "bookmark_count", "review_count", "rating_sum"]
+
+
+class BlockStatsService:
+    @staticmethod
+    def increment(block_id, **deltas):
+        """
+        Apply counter deltas, e.g. increment(block.id, like_count=1), as one
+        UPDATE ... SET x = x + n. Decrements stop at 0, so a counter that
+        drifted below the real count never fails the unsigned CHECK. A block
+        without a stats row yet is reconciled instead, which already counts
+        the current change.
+        """
+        changes = {
+            field: F(field) + delta if delta > 0 else Greatest(F(field) + delta, 0)
+            for field, delta in deltas.items() if delta
+        }
+        if not changes:
+            return
+        updated = BlockStats.objects.filter(block_id=block_id).update(**changes)
+        if not updated:
+            BlockStatsService.reconcile(ItemBlock.objects.filter(pk=block_id))
+
+    @staticmethod
+    def with_actual_counts(queryset):
+        """Annotate blocks with counters computed from the reaction tables."""
+        def aggregate_of(model, aggregate):
+            return Coalesce(Subquery(
+                model.objects.filter(block=OuterRef('pk'))
+                .order_by()
+                .values('block')
+                .annotate(total=aggregate)
+                .values('total')
+            ), Value(0))
+
+        return queryset.annotate(
+            actual_like_count=aggregate_of(Like, Count('pk')),
+            actual_view_count=aggregate_of(View, Count('pk')),
+            actual_bookmark_count=aggregate_of(Bookmark, Count('pk')),
+            actual_review_count=aggregate_of(Review, Count('pk')),
+            actual_rating_sum=aggregate_of(Review, Sum('rating')),
+        )
+
+    @staticmethod
+    def reconcile(blocks):
+        """Recompute the counters of `blocks` and upsert them; returns the row count."""
+        rows = BlockStatsService.with_actual_counts(blocks.order_by()).values(
+            'pk', *[f'actual_{field}' for field in COUNTER_FIELDS]
+        )
+        stats = [
+            BlockStats(block_id=row['pk'], **{field: row[f'actual_{field}'] for field in COUNTER_FIELDS})
+            for row in rows
+        ]
+        BlockStats.objects.bulk_create(
+            stats,
+            update_conflicts=True,
+            unique_fields=['block'],
+            update_fields=COUNTER_FIELDS,
+        )
+        return len(stats)
@@ -0,0 +1,43 @@
+from apps.reaction.models import Comment
+
+
+class CommentThreadService:
+    @staticmethod
+    def get_root_comments(block):
+        """Top-level comments of a block, ready for KeysetPagination."""
+        return Comment.objects.filter(block=block, parent__isnull=True).select_related('user')
+
+    @staticmethod
+    def attach_replies(roots, max_depth=None, replies_limit=None):
+        """
+        Load every reply of the roots' block in one flat query and link them
+        in Python in O(n): every comment gets `thread_replies` (oldest first,
+        at most `replies_limit`) and `reply_count`, the number of its direct
+        replies. Levels deeper than `max_depth` are only counted.
+        """
+        if not roots:
+            return roots
+
+        children = {}
+        replies = Comment.objects.filter(
+            block_id__in={comment.block_id for comment in roots}, parent__isnull=False
+        ).select_related('user').order_by('created_at', 'id')
+        for reply in replies:
+            children.setdefault(reply.parent_id, []).append(reply)
+
+        level = list(roots)
+        depth = 0
+        while level:
+            next_level = []
+            for comment in level:
+                comment_replies = children.get(comment.pk, [])
+                comment.reply_count = len(comment_replies)
+                if max_depth is not None and depth >= max_depth:
+                    comment_replies = []
+                elif replies_limit is not None:
+                    comment_replies = comment_replies[:replies_limit]
+                comment.thread_replies = comment_replies
+                next_level.extend(comment_replies)
+            level = next_level
+            depth += 1
+        return roots
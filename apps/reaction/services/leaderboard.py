@@ -0,0 +1,180 @@
+import heapq
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+from apps.item.models import Category, ItemBlock
+from apps.reaction.models import BlockScore, BlockStats, Like, View
+
+BOARDS = {
+    "trending": "trending_score",
+    "top_rated": "rating_score",
+}
+
+
+class LeaderboardService:
+    """
+    Precomputed block rankings.
+
+    compute() (run by the compute_leaderboards task) scores the blocks that
+    had views or likes in the window or have reviews, and resets the score
+    of every other block to zero in one UPDATE:
+
+    - trending: views and likes of the last TRENDING_WINDOW_DAYS, each day
+      weighted by 0.5 ** (age / TRENDING_HALF_LIFE_DAYS);
+    - top_rated: Bayesian average rating, the block's reviews plus
+      TRENDING_RATING_PRIOR virtual reviews at the global mean; 0 for a
+      block without reviews.
+
+    The top LEADERBOARD_SIZE blocks of each board are written to a Redis
+    sorted set per scope (all blocks and every category, a block counting for
+    its category and all ancestors) and every score to BlockScore. get_top()
+    is then a single ZREVRANGE, with BlockScore as the fallback.
+    """
+
+    KEY = "reaction:leaderboard:{board}:{scope}"
+    SCOPES_KEY = "reaction:leaderboard:keys"
+    ALL = "all"
+    LIKE_WEIGHT = 3.0
+
+    @staticmethod
+    def _key(board, category_id=None):
+        scope = LeaderboardService.ALL if category_id is None else category_id
+        return LeaderboardService.KEY.format(board=board, scope=scope)
+
+    @staticmethod
+    def _decayed_counts(model, now, window_days, half_life_days):
+        """{block_id: decayed count} from one GROUP BY block, day query."""
+        rows = (
+            model.objects.filter(created_at__gte=now - timedelta(days=window_days))
+            .order_by()
+            .annotate(day=TruncDate("created_at"))
+            .values("block_id", "day")
+            .annotate(total=Count("pk"))
+            .values_list("block_id", "day", "total")
+        )
+        today = timezone.localdate(now)
+        counts = {}
+        for block_id, day, total in rows:
+            weight = 0.5 ** ((today - day).days / half_life_days)
+            counts[block_id] = counts.get(block_id, 0) + total * weight
+        return counts
+
+    @staticmethod
+    def compute():
+        """Recompute the scores and publish the rankings; returns the number of blocks scored."""
+        now = timezone.now()
+        window = settings.TRENDING_WINDOW_DAYS
+        half_life = settings.TRENDING_HALF_LIFE_DAYS
+        prior = settings.TRENDING_RATING_PRIOR
+
+        views = LeaderboardService._decayed_counts(View, now, window, half_life)
+        likes = LeaderboardService._decayed_counts(Like, now, window, half_life)
+        reviews = {
+            block_id: (review_count, rating_sum)
+            for block_id, review_count, rating_sum in BlockStats.objects.filter(review_count__gt=0)
+            .values_list("block_id", "review_count", "rating_sum")
+        }
+        review_total = sum(count for count, _ in reviews.values())
+        rating_total = sum(rating for _, rating in reviews.values())
+        mean = rating_total / review_total if review_total else 0
+
+        # Only blocks with recent activity or reviews can score above zero
+        paths = {}
+        active = sorted(views.keys() | likes.keys() | reviews.keys())
+        for start in range(0, len(active), 5000):
+            paths.update(
+                ItemBlock.objects.filter(pk__in=active[start:start + 5000])
+                .values_list("pk", "item__category__path")
+            )
+
+        scores = []
+        for block_id in paths:
+            trending = views.get(block_id, 0) + LeaderboardService.LIKE_WEIGHT * likes.get(block_id, 0)
+            review_count, rating_sum = reviews.get(block_id, (0, 0))
+            rating = (prior * mean + rating_sum) / (prior + review_count) if review_count else 0
+            scores.append(BlockScore(
+                block_id=block_id,
+                trending_score=round(trending, 4),
+                rating_score=round(rating, 4),
+                computed_at=now,
+            ))
+
+        with transaction.atomic():
+            BlockScore.objects.bulk_create(
+                scores,
+                update_conflicts=True,
+                unique_fields=["block"],
+                update_fields=["trending_score", "rating_score", "computed_at"],
+                batch_size=1000,
+            )
+            # Blocks that went quiet since the last run
+            BlockScore.objects.filter(
+                Q(trending_score__gt=0) | Q(rating_score__gt=0), computed_at__lt=now
+            ).update(trending_score=0, rating_score=0, computed_at=now)
+
+        LeaderboardService._publish(scores, {block_id: path or "" for block_id, path in paths.items()})
+        return len(scores)
+
+    @staticmethod
+    def _publish(scores, paths):
+        size = settings.LEADERBOARD_SIZE
+        scopes = {None: scores}
+        for score in scores:
+            for category_id in paths[score.block_id].split("/")[:-1]:
+                scopes.setdefault(int(category_id), []).append(score)
+
+        redis = get_redis_connection("default")
+        keys = set()
+        pipe = redis.pipeline(transaction=True)
+        for board, field in BOARDS.items():
+            for category_id, members in scopes.items():
+                ranked = [score for score in members if getattr(score, field) > 0]
+                top = heapq.nlargest(size, ranked, key=lambda score: getattr(score, field))
+                key = LeaderboardService._key(board, category_id)
+                if not top:
+                    pipe.delete(key)
+                    continue
+                tmp = f"{key}:tmp"
+                pipe.delete(tmp)
+                pipe.zadd(tmp, {score.block_id: getattr(score, field) for score in top})
+                pipe.rename(tmp, key)
+                keys.add(key)
+
+        # Drop rankings of categories that no longer have blocks
+        stale = {key.decode() for key in redis.smembers(LeaderboardService.SCOPES_KEY)} - keys
+        if stale:
+            pipe.delete(*stale)
+        pipe.delete(LeaderboardService.SCOPES_KEY)
+        if keys:
+            pipe.sadd(LeaderboardService.SCOPES_KEY, *keys)
+        pipe.execute()
+
+    @staticmethod
+    def get_top(board, category_id=None, limit=20):
+        """[(block_id, score)] best first."""
+        try:
+            redis = get_redis_connection("default")
+            key = LeaderboardService._key(board, category_id)
+            pipe = redis.pipeline(transaction=False)
+            pipe.exists(key)
+            pipe.zrevrange(key, 0, limit - 1, withscores=True)
+            exists, top = pipe.execute()
+            if exists:
+                return [(int(member), score) for member, score in top]
+        except Exception:
+            pass
+
+        field = BOARDS[board]
+        scores = BlockScore.objects.filter(**{f"{field}__gt": 0}).order_by(f"-{field}", "block_id")
+        if category_id is not None:
+            category = Category.objects.only("path").filter(pk=category_id).first()
+            if category is None:
+                return []
+            scores = scores.filter(category.subtree_filter("block__item__category"))
+        return list(scores.values_list("block_id", field)[:limit])
@@ -0,0 +1,200 @@
+import threading
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+from apps.common.services.stats_log import StatsLogger
+from apps.reaction.models import Bookmark, Like
+
+# Replace the set with a database snapshot unless the generation moved since
+# the snapshot was read. KEYS: set, generation; ARGV: generation read,
+# timeout, members...
+WARM_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+for start = 3, #ARGV, 1000 do
+    redis.call('SADD', KEYS[1], unpack(ARGV, start, math.min(start + 999, #ARGV)))
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+# Apply SADD/SREM to a warm set and advance the generation either way.
+# KEYS: set, generation; ARGV: command, member, sentinel, timeout
+UPDATE_SCRIPT = """
+if redis.call('SISMEMBER', KEYS[1], ARGV[3]) == 1 then
+    redis.call(ARGV[1], KEYS[1], ARGV[2])
+end
+redis.call('INCR', KEYS[2])
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+return 1
+"""
+
+
+class ReactionSetCache:
+    """
+    Per-user Redis set of block ids the user reacted to (liked, bookmarked).
+
+    Sets are warmed lazily from the database on first use and then kept in
+    sync by ReactionToggleService. A sentinel member marks a warm set, so a
+    single SMISMEMBER answers both "is it loaded" and the flags for a whole
+    page of blocks. When Redis is unavailable the database is queried
+    instead. Hit/miss/fallback counters are kept per process and logged
+    every `stats_interval` seconds.
+
+    Every toggle advances a per-user generation, warm or cold set alike, and
+    a warm only stores its snapshot if the generation did not move since the
+    database read. A reaction committed while a set was being warmed thus
+    leaves it cold instead of missing from it.
+
+    A toggle that cannot reach Redis leaves the user's set stale. The user is
+    then remembered as a pending invalidation: this process answers that
+    user from the database and drops the set as soon as Redis responds
+    again, instead of leaving it stale until it expires.
+    """
+
+    KEY = "reaction:{kind}:{user_id}"
+    GENERATION_KEY = "reaction:{kind}:{user_id}:generation"
+    SENTINEL = 0  # never a block id
+
+    def __init__(self, kind, model, timeout=24 * 60 * 60, stats_interval=0):
+        self.kind = kind
+        self.model = model
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._pending_invalidations = set()
+        self.hits = 0
+        self.misses = 0
+        self.fallbacks = 0
+        self.stats_logger = StatsLogger(f"reaction_cache:{kind}", self, stats_interval)
+
+    def _key(self, user_id):
+        return self.KEY.format(kind=self.kind, user_id=user_id)
+
+    def _generation_key(self, user_id):
+        return self.GENERATION_KEY.format(kind=self.kind, user_id=user_id)
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def contains(self, user_id, block_ids):
+        """Return {block_id: bool} for the given blocks."""
+        block_ids = list(block_ids)
+        if not block_ids:
+            return {}
+
+        self.stats_logger.tick()
+        try:
+            redis = get_redis_connection("default")
+            self._flush_pending_invalidations(redis)
+            key = self._key(user_id)
+            flags = redis.smismember(key, [self.SENTINEL, *block_ids])
+            if flags[0]:
+                self._count("hits")
+                return {block_id: bool(flag) for block_id, flag in zip(block_ids, flags[1:], strict=True)}
+
+            self._count("misses")
+            generation_key = self._generation_key(user_id)
+            generation = redis.get(generation_key) or b""
+            reacted = set(self.model.objects.filter(user_id=user_id).values_list("block_id", flat=True))
+            redis.register_script(WARM_SCRIPT)(
+                keys=[key, generation_key],
+                args=[generation, self.timeout, self.SENTINEL, *reacted],
+            )
+        except Exception:
+            self._count("fallbacks")
+            reacted = set(
+                self.model.objects.filter(user_id=user_id, block_id__in=block_ids).values_list("block_id", flat=True)
+            )
+        return {block_id: block_id in reacted for block_id in block_ids}
+
+    def _update(self, command, user_id, block_id):
+        # Only touch warm sets; a cold one is loaded from the database anyway.
+        try:
+            redis = get_redis_connection("default")
+            self._flush_pending_invalidations(redis)
+            redis.register_script(UPDATE_SCRIPT)(
+                keys=[self._key(user_id), self._generation_key(user_id)],
+                args=[command, block_id, self.SENTINEL, self.timeout],
+            )
+        except Exception:
+            self.invalidate(user_id)
+
+    def add(self, user_id, block_id):
+        self._update("sadd", user_id, block_id)
+
+    def discard(self, user_id, block_id):
+        self._update("srem", user_id, block_id)
+
+    def invalidate(self, user_id):
+        """Drop the user's set and advance its generation; retried later if Redis fails."""
+        try:
+            self._delete(get_redis_connection("default"), [user_id])
+        except Exception:
+            with self._lock:
+                self._pending_invalidations.add(user_id)
+
+    def _delete(self, redis, user_ids):
+        pipe = redis.pipeline(transaction=True)
+        for user_id in user_ids:
+            pipe.delete(self._key(user_id))
+            pipe.incr(self._generation_key(user_id))
+            pipe.expire(self._generation_key(user_id), self.timeout)
+        pipe.execute()
+
+    def _flush_pending_invalidations(self, redis):
+        """Retry failed invalidations; raises while Redis still fails, so callers fall back to the database."""
+        if not self._pending_invalidations:
+            return
+        with self._lock:
+            pending = list(self._pending_invalidations)
+        self._delete(redis, pending)
+        with self._lock:
+            self._pending_invalidations.difference_update(pending)
+
+    def stats(self):
+        """Counters for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "fallbacks": self.fallbacks,
+                "pending_invalidations": len(self._pending_invalidations),
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+REACTION_CACHE_TIMEOUT = getattr(settings, "REACTION_CACHE_TIMEOUT", 24 * 60 * 60)
+
+CACHE_STATS_LOG_INTERVAL = getattr(settings, "CACHE_STATS_LOG_INTERVAL", 0)
+
+liked_blocks = ReactionSetCache(
+    "like", Like, timeout=REACTION_CACHE_TIMEOUT, stats_interval=CACHE_STATS_LOG_INTERVAL
+)
+bookmarked_blocks = ReactionSetCache(
+    "bookmark", Bookmark, timeout=REACTION_CACHE_TIMEOUT, stats_interval=CACHE_STATS_LOG_INTERVAL
+)
+
+REACTION_CACHES = {
+    Like: liked_blocks,
+    Bookmark: bookmarked_blocks,
+}
+
+
+def get_reaction_flags(user, block_ids):
+    """
+    {"liked": {block_id: bool}, "bookmarked": {...}} for a page of blocks,
+    one SMISMEMBER per set once warm. Anonymous users get all False.
+    """
+    block_ids = list(block_ids)
+    if not user.is_authenticated:
+        empty = dict.fromkeys(block_ids, False)
+        return {"liked": empty, "bookmarked": empty}
+    return {
+        "liked": liked_blocks.contains(user.pk, block_ids),
+        "bookmarked": bookmarked_blocks.contains(user.pk, block_ids),
+    }
@@ -0,0 +1,26 @@
+from apps.reaction.models import Review
+from apps.reaction.services.reaction_cache import get_reaction_flags
+
+
+class ReactionStateService:
+    @staticmethod
+    def get_states(user, block_ids):
+        """
+        The user's reactions to each of `block_ids`. Likes and bookmarks come
+        from the per-user Redis sets (falling back to the database), ratings
+        from one indexed IN query on Review. Returns one dict per block id,
+        in the given order.
+        """
+        block_ids = list(dict.fromkeys(block_ids))
+        flags = get_reaction_flags(user, block_ids)
+        ratings = dict(Review.objects.filter(user=user, block_id__in=block_ids).values_list('block_id', 'rating'))
+
+        return [
+            {
+                'block': block_id,
+                'liked': flags['liked'][block_id],
+                'bookmarked': flags['bookmarked'][block_id],
+                'my_rating': ratings.get(block_id),
+            }
+            for block_id in block_ids
+        ]
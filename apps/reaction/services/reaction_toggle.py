@@ -0,0 +1,92 @@
+from functools import partial
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.item.models import ItemBlock
+from apps.reaction.models import BlockStats
+from apps.reaction.services.block_stats import BlockStatsService
+from apps.reaction.services.reaction_cache import REACTION_CACHES
+
+
+class ReactionToggleService:
+    """
+    One-statement add/remove for per-user block reactions (Like, Bookmark).
+
+    Each call is a single INSERT ... ON CONFLICT DO NOTHING or DELETE whose
+    CTE also moves the matching BlockStats counter, so a toggle is one round
+    trip. The per-user Redis sets (reaction_cache) follow on commit. The
+    block check is part of the same statement (Django creates FKs
+    as DEFERRABLE INITIALLY DEFERRED, so a violation would only surface at
+    commit). Views calling it opt out of ATOMIC_REQUESTS so that no
+    BEGIN/COMMIT is added around the statement.
+    """
+
+    @staticmethod
+    def _stats_update(counter, source, sign):
+        stats = BlockStats._meta.db_table
+        value = f'"{stats}"."{counter}" {sign} 1'
+        if sign == "-":
+            # A counter that drifted low must not fail the unsigned CHECK
+            value = f'GREATEST({value}, 0)'
+        return (
+            f'UPDATE "{stats}" SET "{counter}" = {value} '
+            f'FROM {source} WHERE "{stats}"."block_id" = {source}."block_id" '
+            f'RETURNING "{stats}"."block_id"'
+        )
+
+    @staticmethod
+    def add(model, counter, user_id, block_id):
+        """
+        Insert the reaction; returns its id, or None if it already existed.
+        Raises ItemBlock.DoesNotExist for an unknown block.
+        """
+        now = timezone.now()
+        block_exists = f'EXISTS (SELECT 1 FROM "{ItemBlock._meta.db_table}" WHERE "id" = %s)'
+        sql = (
+            f'WITH inserted AS ('
+            f'INSERT INTO "{model._meta.db_table}" ("user_id", "block_id", "created_at", "updated_at") '
+            f'SELECT %s, %s, %s, %s WHERE {block_exists} '
+            f'ON CONFLICT ("user_id", "block_id") DO NOTHING '
+            f'RETURNING "id", "block_id"'
+            f'), counted AS ({ReactionToggleService._stats_update(counter, "inserted", "+")}) '
+            f'SELECT (SELECT "id" FROM inserted), (SELECT count(*) FROM counted), {block_exists}'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [user_id, block_id, now, now, block_id, block_id])
+            reaction_id, counted, exists = cursor.fetchone()
+
+        if not exists:
+            raise ItemBlock.DoesNotExist
+        if reaction_id is None:
+            return None
+        if not counted:
+            BlockStatsService.reconcile(ItemBlock.objects.filter(pk=block_id))
+        transaction.on_commit(partial(REACTION_CACHES[model].add, user_id, int(block_id)))
+        return reaction_id
+
+    @staticmethod
+    def remove(model, counter, user_id, block_id=None, pk=None):
+        """
+        Delete the user's reaction by block or by id; returns the block id
+        it belonged to, or None if there was nothing to delete.
+        """
+        column, value = ("block_id", block_id) if pk is None else ("id", pk)
+        sql = (
+            f'WITH deleted AS ('
+            f'DELETE FROM "{model._meta.db_table}" WHERE "user_id" = %s AND "{column}" = %s '
+            f'RETURNING "block_id"'
+            f'), counted AS ({ReactionToggleService._stats_update(counter, "deleted", "-")}) '
+            f'SELECT deleted.block_id, (SELECT count(*) FROM counted) FROM deleted'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [user_id, value])
+            row = cursor.fetchone()
+        if row is None:
+            return None
+
+        removed_block_id, counted = row
+        if not counted:
+            BlockStatsService.reconcile(ItemBlock.objects.filter(pk=removed_block_id))
+        transaction.on_commit(partial(REACTION_CACHES[model].discard, user_id, removed_block_id))
+        return removed_block_id
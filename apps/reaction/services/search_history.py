@@ -0,0 +1,82 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from apps.item.models import ItemBlock
+from apps.reaction.models import SearchHistory
+
+
+class SearchHistoryService:
+    """
+    Write path of the per-user search history.
+
+    A search is recorded with one INSERT ... ON CONFLICT on (user,
+    normalized query, block): a repeated search moves the existing row to the
+    top and bumps its hit count instead of adding a row. Histories are capped
+    at SEARCH_HISTORY_LIMIT entries by the prune_search_history task, not on
+    the request path. The unique index skips rows not yet backfilled
+    (empty normalized query), so the conflict target repeats its predicate.
+    """
+
+    @staticmethod
+    def record(user_id, query, block_id):
+        """
+        Upsert the entry and return its id. Raises ItemBlock.DoesNotExist
+        for an unknown block.
+        """
+        now = timezone.now()
+        table = SearchHistory._meta.db_table
+        sql = (
+            f'INSERT INTO "{table}" '
+            f'("user_id", "query", "normalized_query", "block_id", "hit_count", "created_at", "updated_at") '
+            f'SELECT %s, %s, %s, %s, 1, %s, %s '
+            f'WHERE EXISTS (SELECT 1 FROM "{ItemBlock._meta.db_table}" WHERE "id" = %s) '
+            f'ON CONFLICT ("user_id", "normalized_query", "block_id") WHERE "normalized_query" <> \'\' '
+            f'DO UPDATE SET '
+            f'"query" = EXCLUDED."query", "hit_count" = "{table}"."hit_count" + 1, '
+            f'"created_at" = EXCLUDED."created_at", "updated_at" = EXCLUDED."updated_at" '
+            f'RETURNING "id"'
+        )
+        params = [user_id, query, SearchHistory.normalize_query(query), block_id, now, now, block_id]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+        if row is None:
+            raise ItemBlock.DoesNotExist
+        return row[0]
+
+    @staticmethod
+    def prune(limit=None, batch_size=1000):
+        """
+        Delete everything past the newest `limit` entries of each user, at
+        most `batch_size` rows per transaction; returns the number deleted.
+        """
+        limit = limit or settings.SEARCH_HISTORY_LIMIT
+        over_limit = list(
+            SearchHistory.objects.order_by().values('user_id')
+            .annotate(total=Count('pk')).filter(total__gt=limit)
+            .values_list('user_id', flat=True)
+        )
+
+        deleted = 0
+        for start in range(0, len(over_limit), 100):
+            users = over_limit[start:start + 100]
+            while True:
+                ids = list(
+                    SearchHistory.objects.filter(user_id__in=users)
+                    .annotate(rank=Window(
+                        RowNumber(),
+                        partition_by=F('user_id'),
+                        order_by=[F('created_at').desc(), F('id').desc()],
+                    ))
+                    .filter(rank__gt=limit)
+                    .values_list('pk', flat=True)[:batch_size]
+                )
+                if not ids:
+                    break
+                with transaction.atomic():
+                    count, _ = SearchHistory.objects.filter(pk__in=ids).delete()
+                deleted += count
+        return deleted
@@ -0,0 +1,191 @@
+import json
+import logging
+import time
+import uuid
+from collections import Counter
+from datetime import UTC, datetime, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max
+from django_redis import get_redis_connection
+
+from apps.common.services.mail_dispatcher import CLAIM_SCRIPT, RECOVER_SCRIPT
+from apps.item.models import ItemBlock
+from apps.reaction.models import View
+from apps.reaction.services.block_stats import BlockStatsService
+from apps.users.models import User
+
+logger = logging.getLogger(__name__)
+
+
+class ViewBufferService:
+    """
+    Write-behind recording of block views.
+
+    The request path only appends an event to a Redis list; the
+    flush_view_buffer task drains it in batches, drops repeated views of the
+    same block by the same user within VIEW_DEDUPE_WINDOW seconds, inserts
+    the rest and bumps BlockStats.view_count in the same transaction. Views
+    are stored with the time of the event, not of the flush.
+
+    A batch is moved (LMOVE) into a processing list leased to the flush and
+    deleted only after the transaction committed; the batch of a flush that
+    failed or died goes back to the buffer when its lease expires. Replaying
+    a batch whose views were already stored is harmless, the dedupe window
+    skips them.
+    """
+
+    BUFFER_KEY = "reaction:view_buffer"
+    PROCESSING_KEY = "reaction:view_buffer:processing:{batch_id}"
+    LEASES_KEY = "reaction:view_buffer:processing"
+    LEASE_TIMEOUT = 35 * 60  # seconds, longer than CELERY_TASK_TIME_LIMIT
+
+    @staticmethod
+    def _redis():
+        return get_redis_connection("default")
+
+    @staticmethod
+    def record(user_id, block_id):
+        """Buffer one view: a single RPUSH."""
+        event = json.dumps({"user": str(user_id), "block": block_id, "ts": time.time()})
+        ViewBufferService._redis().rpush(ViewBufferService.BUFFER_KEY, event)
+
+    @staticmethod
+    def pending():
+        return ViewBufferService._redis().llen(ViewBufferService.BUFFER_KEY)
+
+    @staticmethod
+    def _claim_batch(batch_size):
+        """(batch id, [raw events]) moved from the buffer to a leased processing list."""
+        batch_id = uuid.uuid4().hex
+        events = ViewBufferService._redis().register_script(CLAIM_SCRIPT)(
+            keys=[
+                ViewBufferService.BUFFER_KEY,
+                ViewBufferService.PROCESSING_KEY.format(batch_id=batch_id),
+                ViewBufferService.LEASES_KEY,
+            ],
+            args=[batch_size, batch_id, time.time() + ViewBufferService.LEASE_TIMEOUT],
+        )
+        return batch_id, events
+
+    @staticmethod
+    def _release_batch(batch_id):
+        pipe = ViewBufferService._redis().pipeline(transaction=True)
+        pipe.delete(ViewBufferService.PROCESSING_KEY.format(batch_id=batch_id))
+        pipe.zrem(ViewBufferService.LEASES_KEY, batch_id)
+        pipe.execute()
+
+    @staticmethod
+    def recover():
+        """Return the batches of flushes whose lease expired to the buffer; returns how many events."""
+        redis = ViewBufferService._redis()
+        recover = redis.register_script(RECOVER_SCRIPT)
+        moved = 0
+        for batch_id in redis.zrangebyscore(ViewBufferService.LEASES_KEY, "-inf", time.time()):
+            batch_id = batch_id.decode()
+            moved += recover(
+                keys=[
+                    ViewBufferService.PROCESSING_KEY.format(batch_id=batch_id),
+                    ViewBufferService.BUFFER_KEY,
+                    ViewBufferService.LEASES_KEY,
+                ],
+                args=[batch_id],
+            )
+        return moved
+
+    @staticmethod
+    def _parse(raw_events):
+        events = []
+        for raw in raw_events:
+            try:
+                event = json.loads(raw)
+                events.append({"user": str(event["user"]), "block": int(event["block"]), "ts": float(event["ts"])})
+            except (ValueError, KeyError, TypeError):
+                logger.warning("Dropping unreadable view event %r", raw)
+        return events
+
+    @staticmethod
+    def _dedupe(events, window):
+        """Keep the first view of each (user, block) per `window` seconds."""
+        kept = []
+        last_seen = {}
+        for event in sorted(events, key=lambda e: e["ts"]):
+            key = (event["user"], event["block"])
+            if key in last_seen and event["ts"] - last_seen[key] < window:
+                continue
+            last_seen[key] = event["ts"]
+            kept.append(event)
+        return kept
+
+    @staticmethod
+    def flush(batch_size=None, window=None):
+        """Drain up to `batch_size` buffered views; returns the number stored."""
+        batch_size = batch_size or settings.VIEW_BUFFER_BATCH_SIZE
+        window = settings.VIEW_DEDUPE_WINDOW if window is None else window
+
+        ViewBufferService.recover()
+        batch_id, raw_events = ViewBufferService._claim_batch(batch_size)
+        if not raw_events:
+            return 0
+
+        # The batch stays leased until the views are committed
+        with transaction.atomic():
+            stored = ViewBufferService._store(ViewBufferService._parse(raw_events), window)
+            transaction.on_commit(lambda: ViewBufferService._release_batch(batch_id))
+        return stored
+
+    @staticmethod
+    def _store(events, window):
+        """Insert the new views among `events` and count them; returns the number stored."""
+        events = ViewBufferService._dedupe(events, window)
+        if not events:
+            return 0
+
+        block_ids = {event["block"] for event in events}
+        user_ids = {event["user"] for event in events}
+        existing_blocks = set(ItemBlock.objects.filter(pk__in=block_ids).values_list("pk", flat=True))
+        existing_users = {str(pk) for pk in User.objects.filter(pk__in=user_ids).values_list("pk", flat=True)}
+
+        # Last view stored by earlier flushes, for pairs still inside the window
+        since = datetime.fromtimestamp(min(event["ts"] for event in events), tz=UTC)
+        last_stored = {
+            (str(user_id), block_id): last.timestamp()
+            for user_id, block_id, last in View.objects.filter(
+                user_id__in=user_ids,
+                block_id__in=block_ids,
+                created_at__gte=since - timedelta(seconds=window),
+            ).values("user_id", "block_id").annotate(last=Max("created_at")).values_list(
+                "user_id", "block_id", "last"
+            )
+        }
+
+        views = [
+            (event["user"], event["block"], datetime.fromtimestamp(event["ts"], tz=UTC))
+            for event in events
+            if event["block"] in existing_blocks
+            and event["user"] in existing_users
+            and event["ts"] - last_stored.get((event["user"], event["block"]), float("-inf")) >= window
+        ]
+        if not views:
+            return 0
+
+        ViewBufferService._insert(views)
+        for block_id, count in Counter(block_id for _, block_id, _ in views).items():
+            BlockStatsService.increment(block_id, view_count=count)
+        return len(views)
+
+    @staticmethod
+    def _insert(views):
+        """
+        Insert (user_id, block_id, viewed_at) rows in one statement. Raw SQL,
+        because auto_now_add would overwrite created_at with the flush time.
+        """
+        user_ids, block_ids, viewed_at = zip(*views, strict=True)
+        sql = (
+            f'INSERT INTO "{View._meta.db_table}" ("user_id", "block_id", "created_at", "updated_at") '
+            f'SELECT "user_id", "block_id", "viewed_at", "viewed_at" '
+            f'FROM unnest(%s::uuid[], %s::bigint[], %s::timestamptz[]) AS v ("user_id", "block_id", "viewed_at")'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [list(user_ids), list(block_ids), list(viewed_at)])
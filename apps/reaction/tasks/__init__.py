@@ -0,0 +1,4 @@
+from .block_stats import reconcile_block_stats  # noqa
+from .leaderboard import compute_leaderboards  # noqa
+from .search_history import prune_search_history  # noqa
+from .views import flush_view_buffer  # noqa
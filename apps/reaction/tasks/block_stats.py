@@ -0,0 +1,22 @@
+from celery import shared_task
+from django.db import transaction
+
+from apps.item.models import ItemBlock
+from apps.reaction.services.block_stats import BlockStatsService
+
+
+@shared_task
+def reconcile_block_stats(batch_size=1000):
+    """Correct drift of BlockStats against the reaction tables, one transaction per batch."""
+    last_pk = 0
+    total = 0
+    while True:
+        block_ids = list(
+            ItemBlock.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size]
+        )
+        if not block_ids:
+            break
+        with transaction.atomic():
+            total += BlockStatsService.reconcile(ItemBlock.objects.filter(pk__in=block_ids))
+        last_pk = block_ids[-1]
+    return total
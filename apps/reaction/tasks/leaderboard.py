@@ -0,0 +1,9 @@
+from celery import shared_task
+
+from apps.reaction.services.leaderboard import LeaderboardService
+
+
+@shared_task
+def compute_leaderboards():
+    """Recompute trending and top-rated block rankings."""
+    return LeaderboardService.compute()
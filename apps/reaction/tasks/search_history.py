@@ -0,0 +1,9 @@
+from celery import shared_task
+
+from apps.reaction.services.search_history import SearchHistoryService
+
+
+@shared_task
+def prune_search_history(batch_size=1000):
+    """Cap every user's search history at SEARCH_HISTORY_LIMIT entries."""
+    return SearchHistoryService.prune(batch_size=batch_size)
@@ -0,0 +1,14 @@
+from celery import shared_task
+
+from apps.reaction.services.view_buffer import ViewBufferService
+
+
+@shared_task
+def flush_view_buffer(max_batches=10):
+    """Drain buffered block views into the View table."""
+    total = 0
+    for _ in range(max_batches):
+        total += ViewBufferService.flush()
+        if not ViewBufferService.pending():
+            break
+    return total
@@ -4,16 +4,19 @@ from .views import (
     BookmarkListAPIView,
     BookmarkCreateAPIView,
     BookmarkDestroyAPIView,
+    BookmarkToggleAPIView,
     CommentDetailAPIView,
     CommentListAPIView,
     CommentCreateAPIView,
     CommentDeleteAPIView,
     LikeToggleAPIView,
+    ReactionStateAPIView,
     ReviewDetailAPIView,
     ReviewListCreateAPIView,
     SearchHistoryClearAPIView,
     SearchHistoryListAPIView,
     SearchHistoryCreateAPIView,
+    ViewRecordAPIView,
 )
 
 
@@ -27,7 +30,10 @@ urlpatterns = [
     path('comments/create/<int:block_pk>/', CommentCreateAPIView.as_view(), name='comment-create'),
     path('comments/<int:id>/', CommentDetailAPIView.as_view(), name='comment-detail'),
     path('comments/delete/<int:pk>/', CommentDeleteAPIView.as_view(), name='comment-delete'),
+    path('blocks/reaction-state/', ReactionStateAPIView.as_view(), name='reaction-state'),
+    path('blocks/<int:block_pk>/bookmark/', BookmarkToggleAPIView.as_view(), name='bookmark-toggle'),
     path('blocks/<int:block_pk>/like/', LikeToggleAPIView.as_view(), name='like-toggle'),
+    path('blocks/<int:block_pk>/view/', ViewRecordAPIView.as_view(), name='view-record'),
     path('blocks/<int:block_pk>/reviews/', ReviewListCreateAPIView.as_view(), name='review-list-create'),
     path('reviews/<int:pk>/', ReviewDetailAPIView.as_view(), name='review-detail'),
     path('search-history/', SearchHistoryListAPIView.as_view(), name='search-history-list-create'),
@@ -1,5 +1,7 @@
-from .bookmark import BookmarkListAPIView, BookmarkDestroyAPIView, BookmarkCreateAPIView # noqa
+from .bookmark import BookmarkListAPIView, BookmarkDestroyAPIView, BookmarkCreateAPIView, BookmarkToggleAPIView # noqa
 from .comments import CommentListAPIView, CommentDetailAPIView, CommentCreateAPIView, CommentDeleteAPIView # noqa
 from .like import LikeToggleAPIView # noqa
+from .reaction_state import ReactionStateAPIView # noqa
 from .review import ReviewListCreateAPIView, ReviewDetailAPIView # noqa
+from .view import ViewRecordAPIView # noqa
 from .search_history import SearchHistoryListAPIView, SearchHistoryClearAPIView, SearchHistoryCreateAPIView # noqa
@@ -1,11 +1,18 @@
+from django.db import transaction
+from django.http import Http404
+from django.utils.decorators import method_decorator
 from rest_framework.views import APIView
 from rest_framework.generics import CreateAPIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
-from django.shortcuts import get_object_or_404
 
-from apps.reaction.models import Bookmark
+from apps.common.services.paginator import KeysetPagination
+from apps.reaction.models import Bookmark, ItemBlock
 from apps.reaction.serializers.bookmark import BookmarkSerializer
+from apps.reaction.services.reaction_toggle import ReactionToggleService
+
+ALREADY_BOOKMARKED = "Siz bu elementni allaqachon saqlagansiz."
+
 
 class BookmarkListAPIView(APIView):
     """
@@ -18,9 +25,11 @@ class BookmarkListAPIView(APIView):
         Autentifikatsiyadan o'tgan foydalanuvchining barcha bookmark'larini qaytaradi.
         """
         # Faqat so'rov yuborayotgan user'ga tegishli bookmark'larni filterlaymiz
-        bookmarks = Bookmark.objects.filter(user=request.user)
-        serializer = BookmarkSerializer(bookmarks, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        bookmarks = Bookmark.objects.filter(user=request.user).select_related('user')
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(bookmarks, request, view=self)
+        serializer = BookmarkSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
 
 class BookmarkCreateAPIView(CreateAPIView):
@@ -31,12 +40,44 @@ class BookmarkCreateAPIView(CreateAPIView):
     def post(self, request, *args, **kwargs):
         serializer = BookmarkSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save(user=request.user)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            block = serializer.validated_data['block']
+            try:
+                bookmark_id = ReactionToggleService.add(Bookmark, 'bookmark_count', request.user.pk, block.pk)
+            except ItemBlock.DoesNotExist:
+                raise Http404
+            if bookmark_id is None:
+                return Response({"detail": ALREADY_BOOKMARKED}, status=status.HTTP_400_BAD_REQUEST)
+            bookmark = Bookmark(id=bookmark_id, user=request.user, block=block)
+            return Response(BookmarkSerializer(bookmark).data, status=status.HTTP_201_CREATED)
         else:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
+class BookmarkToggleAPIView(APIView):
+    """
+    Block'ni saqlash (POST) va saqlanganlardan olib tashlash (DELETE).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, block_pk, *args, **kwargs):
+        try:
+            bookmark_id = ReactionToggleService.add(Bookmark, 'bookmark_count', request.user.pk, block_pk)
+        except ItemBlock.DoesNotExist:
+            raise Http404
+
+        if bookmark_id is None:
+            return Response({"detail": ALREADY_BOOKMARKED}, status=status.HTTP_400_BAD_REQUEST)
+        bookmark = Bookmark(id=bookmark_id, user=request.user, block_id=block_pk)
+        return Response(BookmarkSerializer(bookmark).data, status=status.HTTP_201_CREATED)
+
+    def delete(self, request, block_pk, *args, **kwargs):
+        if ReactionToggleService.remove(Bookmark, 'bookmark_count', request.user.pk, block_id=block_pk) is None:
+            raise Http404
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
 class BookmarkDestroyAPIView(APIView):
     """
     Ma'lum bir bookmark'ni ID bo'yicha o'chirish.
@@ -47,13 +88,11 @@ class BookmarkDestroyAPIView(APIView):
         """
         ID (pk) bo'yicha bookmark'ni o'chiradi.
         """
-        # Bookmark'ni topishga harakat qilamiz.
-        # Muhim: faqat shu user'ga tegishli ekanligini ham tekshiramiz.
+        # Muhim: faqat shu user'ga tegishli bookmark o'chiriladi.
         # Agar boshqa user'ning bookmark'ini o'chirishga harakat qilinsa, 404 xatolik qaytadi.
-        bookmark = get_object_or_404(Bookmark, pk=pk, user=request.user)
-        
-        bookmark.delete()
-        
+        if ReactionToggleService.remove(Bookmark, 'bookmark_count', request.user.pk, pk=pk) is None:
+            raise Http404
+
         # O'chirish muvaffaqiyatli bo'lsa, bo'sh javob qaytaramiz.
         return Response(status=status.HTTP_204_NO_CONTENT)
     
@@ -61,4 +100,5 @@ __all__ = [
     "BookmarkListAPIView",
     "BookmarkDestroyAPIView",
     "BookmarkCreateAPIView",
-]
\ No newline at end of file
+    "BookmarkToggleAPIView",
+]
@@ -4,9 +4,11 @@ from rest_framework.response import Response
 from rest_framework import status, permissions
 from django.shortcuts import get_object_or_404
 
+from apps.common.services.paginator import KeysetPagination
 from apps.reaction.models import Comment, ItemBlock
 from apps.reaction.serializers.comments import CommentSerializer
 from apps.reaction.permissions import IsOwnerOrReadOnly
+from apps.reaction.services.comment_thread import CommentThreadService
 
 
 class CommentListAPIView(APIView):
@@ -14,10 +16,25 @@ class CommentListAPIView(APIView):
 
     def get(self, request, block_pk, *args, **kwargs):
         block = get_object_or_404(ItemBlock, pk=block_pk)
-        # Faqat parent izohlarni olamiz, ichida replies chiqadi
-        comments = Comment.objects.filter(block=block, parent__isnull=True).order_by('-created_at')
+        # Parent izohlar sahifalab olinadi, barcha replies bitta so'rovda
+        paginator = KeysetPagination()
+        comments = paginator.paginate_queryset(
+            CommentThreadService.get_root_comments(block), request, view=self
+        )
+        CommentThreadService.attach_replies(
+            comments,
+            max_depth=self._get_limit(request, 'max_depth'),
+            replies_limit=self._get_limit(request, 'replies_limit'),
+        )
         serializer = CommentSerializer(comments, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return paginator.get_paginated_response(serializer.data)
+
+    @staticmethod
+    def _get_limit(request, name):
+        try:
+            return max(int(request.query_params[name]), 0)
+        except (KeyError, ValueError):
+            return None
 
 
 class CommentCreateAPIView(CreateAPIView):
@@ -1,22 +1,29 @@
 # your_app/views.py
 
+from django.db import transaction
+from django.http import Http404
+from django.utils.decorators import method_decorator
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
-from django.shortcuts import get_object_or_404
 
 from apps.reaction.models import Like, ItemBlock
 from apps.reaction.serializers.like import LikeSerializer
+from apps.reaction.services.reaction_toggle import ReactionToggleService
 
+
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
 class LikeToggleAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request, block_pk, *args, **kwargs):
-        block = get_object_or_404(ItemBlock, pk=block_pk)
+        try:
+            like_id = ReactionToggleService.add(Like, 'like_count', request.user.pk, block_pk)
+        except ItemBlock.DoesNotExist:
+            raise Http404
 
-        like, created = Like.objects.get_or_create(user=request.user, block=block)
-        
-        if created:
+        if like_id is not None:
+            like = Like(id=like_id, user=request.user, block_id=block_pk)
             serializer = LikeSerializer(like)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         
@@ -29,14 +36,11 @@ class LikeToggleAPIView(APIView):
         """
         Block'dan 'like'ni olib tashlaydi. Agar 'like' mavjud bo'lmasa, 404 xatolik qaytaradi.
         """
-        block = get_object_or_404(ItemBlock, pk=block_pk)
-
-        like = get_object_or_404(Like, user=request.user, block=block)
-        
-        like.delete()
+        if ReactionToggleService.remove(Like, 'like_count', request.user.pk, block_id=block_pk) is None:
+            raise Http404
         
         return Response(status=status.HTTP_204_NO_CONTENT)
     
 __all__ = [
     "LikeToggleAPIView",
-]
\ No newline at end of file
+]
@@ -0,0 +1,34 @@
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.reaction.serializers.reaction_state import (
+    ReactionStateRequestSerializer,
+    ReactionStateSerializer,
+)
+from apps.reaction.services.reaction_state import ReactionStateService
+
+
+class ReactionStateAPIView(APIView):
+    """
+    Bir nechta block uchun joriy user'ning like, bookmark va reytingini qaytaradi.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    @swagger_auto_schema(
+        request_body=ReactionStateRequestSerializer,
+        responses={200: ReactionStateSerializer(many=True)},
+        operation_summary="Block'lar bo'yicha user reaksiyalari",
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = ReactionStateRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        states = ReactionStateService.get_states(request.user, serializer.validated_data['block_ids'])
+        return Response(ReactionStateSerializer(states, many=True).data, status=status.HTTP_200_OK)
+
+
+__all__ = [
+    "ReactionStateAPIView",
+]
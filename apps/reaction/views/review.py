@@ -4,9 +4,11 @@ from rest_framework.response import Response
 from rest_framework import status, permissions, serializers
 from django.shortcuts import get_object_or_404
 
+from apps.common.services.paginator import KeysetPagination
 from apps.reaction.models import Review, ItemBlock
 from apps.reaction.serializers.review import ReviewSerializer
 from apps.reaction.permissions import IsOwnerOrReadOnly 
+from apps.reaction.services.block_stats import BlockStatsService
 
 from rest_framework.generics import ListCreateAPIView
 
@@ -16,22 +18,24 @@ class ReviewListCreateAPIView(ListCreateAPIView):
     """
     serializer_class = ReviewSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         block_pk = self.kwargs.get('block_pk')
         block = get_object_or_404(ItemBlock, pk=block_pk)
-        return Review.objects.filter(block=block)
+        return Review.objects.filter(block=block).select_related('user')
 
     def perform_create(self, serializer):
         block_pk = self.kwargs.get('block_pk')
         block = get_object_or_404(ItemBlock, pk=block_pk)
         try:
-            serializer.save(user=self.request.user, block=block)
+            review = serializer.save(user=self.request.user, block=block)
         except IntegrityError:
             # unique_together (user, block) нарушено
             raise serializers.ValidationError({
                 "detail": "Siz bu block uchun allaqachon sharh yozgansiz."
             })
+        BlockStatsService.increment(block.pk, review_count=1, rating_sum=review.rating)
 
 
 
@@ -52,9 +56,11 @@ class ReviewDetailAPIView(APIView):
         # Faqat egasi o'zgartira olishini tekshirish
         self.check_object_permissions(request, review)
         
+        old_rating = review.rating
         serializer = ReviewSerializer(review, data=request.data)
         if serializer.is_valid():
-            serializer.save()
+            review = serializer.save()
+            BlockStatsService.increment(review.block_id, rating_sum=review.rating - old_rating)
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -67,6 +73,7 @@ class ReviewDetailAPIView(APIView):
         self.check_object_permissions(request, review)
         
         review.delete()
+        BlockStatsService.increment(review.block_id, review_count=-1, rating_sum=-review.rating)
         return Response(status=status.HTTP_204_NO_CONTENT)
     
 __all__ = [
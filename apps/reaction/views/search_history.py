@@ -3,10 +3,12 @@ from drf_yasg.utils import swagger_auto_schema
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
-from django.shortcuts import get_object_or_404
+from django.http import Http404
 
+from apps.common.services.paginator import KeysetPagination
 from apps.reaction.models import SearchHistory, ItemBlock
 from apps.reaction.serializers.search_history import SearchHistorySerializer
+from apps.reaction.services.search_history import SearchHistoryService
 
 class SearchHistoryListAPIView(APIView):
     """
@@ -21,11 +23,12 @@ class SearchHistoryListAPIView(APIView):
         history_items = (
             SearchHistory.objects
             .filter(user=request.user)
-            .select_related('block__item')
-            .order_by('-created_at')
+            .select_related('user', 'block__item')
         )
-        serializer = SearchHistorySerializer(history_items, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(history_items, request, view=self)
+        serializer = SearchHistorySerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
 
 class SearchHistoryCreateAPIView(APIView):
@@ -62,18 +65,14 @@ class SearchHistoryCreateAPIView(APIView):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
         validated_data = serializer.validated_data
-        block_id = validated_data['block_id']
-        query = validated_data['query']
+        try:
+            # Bir xil qidiruv qayta yozilmaydi: mavjud yozuv yuqoriga ko'tariladi
+            history_id = SearchHistoryService.record(request.user.pk, validated_data['query'], validated_data['block_id'])
+        except ItemBlock.DoesNotExist:
+            raise Http404 from None
 
-        block = get_object_or_404(ItemBlock, pk=block_id)
-
-        new_history_item = SearchHistory.objects.create(
-            user=request.user,
-            query=query,
-            block=block
-        )
-
-        response_serializer = SearchHistorySerializer(new_history_item)
+        history_item = SearchHistory.objects.select_related('user', 'block__item').get(pk=history_id)
+        response_serializer = SearchHistorySerializer(history_item)
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
 class SearchHistoryClearAPIView(APIView):
@@ -0,0 +1,27 @@
+from django.db import transaction
+from django.utils.decorators import method_decorator
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status, permissions
+
+from apps.reaction.services.view_buffer import ViewBufferService
+from apps.users.services.custom_auth import StatelessJWTAuthentication
+
+
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
+class ViewRecordAPIView(APIView):
+    """
+    Block ko'rilganini qayd etadi. Yozuv Redis'ga tushadi va
+    flush_view_buffer task'i orqali bazaga yoziladi.
+    """
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, block_pk, *args, **kwargs):
+        ViewBufferService.record(request.user.pk, block_pk)
+        return Response(status=status.HTTP_202_ACCEPTED)
+
+
+__all__ = [
+    "ViewRecordAPIView",
+]
@@ -1,4 +1,5 @@
 import re
+import string
 
 LATIN_TO_CYRILLIC = {
     "a": "а",
@@ -1283,6 +1284,153 @@ CYRILLIC_VOWELS = (
 )
 
 
+# Rules used by to_cyrillic. All patterns below are compiled once at import.
+# These compounds must be converted before other letters
+COMPOUNDS_FIRST = {
+    "ch": "ч",
+    "Ch": "Ч",
+    "CH": "Ч",
+    # this line must come before 's' because it has an 'h'
+    "sh": "ш",
+    "Sh": "Ш",
+    "SH": "Ш",
+    # This line must come before 'yo' because of it's apostrophe
+    "yo‘": "йў",
+    "Yo‘": "Йў",
+    "YO‘": "ЙЎ",
+}
+COMPOUNDS_SECOND = {
+    "yo": "ё",
+    "Yo": "Ё",
+    "YO": "Ё",
+    # 'ts': 'ц', 'Ts': 'Ц', 'TS': 'Ц',  # No need for this, see TS_WORDS
+    "yu": "ю",
+    "Yu": "Ю",
+    "YU": "Ю",
+    "ya": "я",
+    "Ya": "Я",
+    "YA": "Я",
+    "ye": "е",
+    "Ye": "Е",
+    "YE": "Е",
+    # different kinds of apostrophes
+    "o‘": "ў",
+    "O‘": "Ў",
+    "oʻ": "ў",
+    "Oʻ": "Ў",
+    "g‘": "ғ",
+    "G‘": "Ғ",
+    "gʻ": "ғ",
+    "Gʻ": "Ғ",
+}
+LATIN_BEGINNING_RULES = {
+    "ye": "е",
+    "Ye": "Е",
+    "YE": "Е",
+    "e": "э",
+    "E": "Э",
+}
+LATIN_AFTER_VOWEL_RULES = {
+    "ye": "е",
+    "Ye": "Е",
+    "YE": "Е",
+    "e": "э",
+    "E": "Э",
+}
+EXCEPTION_WORDS_RULES = {
+    "s": "ц",
+    "S": "Ц",
+    "ts": "ц",
+    "Ts": "Ц",
+    "TS": "Ц",  # but not tS
+    "e": "э",
+    "E": "э",
+    "sh": "сҳ",
+    "Sh": "Сҳ",
+    "SH": "СҲ",
+    "yo": "йо",
+    "Yo": "Йо",
+    "YO": "ЙО",
+    "yu": "йу",
+    "Yu": "Йу",
+    "YU": "ЙУ",
+    "ya": "йа",
+    "Ya": "Йа",
+    "YA": "ЙА",
+}
+
+
+def _replace_soft_sign_words(m):
+    word = m.group(1)
+    if word.isupper():
+        result = SOFT_SIGN_WORDS[word.lower()].upper()
+    elif word[0].isupper():
+        result = SOFT_SIGN_WORDS[word.lower()]
+        result = result[0].upper() + result[1:]
+    else:
+        result = SOFT_SIGN_WORDS[word.lower()]
+    return result
+
+
+def _replace_exception_words(m):
+    """Replace ц (or э) only leaving other characters unchanged"""
+    return f"{m.group(1)[: m.start(2)]}{EXCEPTION_WORDS_RULES[m.group(2)]}{m.group(1)[m.end(2) :]}"
+
+
+# Exception words in the order they have to be applied, soft sign words first.
+_EXCEPTION_WORDS = [
+    (re.compile(rf"\b({word})", flags=re.U), _replace_soft_sign_words)
+    for word in SOFT_SIGN_WORDS
+] + [
+    (re.compile(rf"\b({word})", flags=re.U), _replace_exception_words)
+    for word in list(TS_WORDS.keys()) + list(E_WORDS.keys())
+]
+
+# Every exception word starts with at least three word characters, so a word
+# can only match where the text has a word start with the same three letters.
+_EXCEPTION_PREFIX_LENGTH = 3
+_EXCEPTION_WORDS_BY_PREFIX = {}
+for _index, _word in enumerate(
+    list(SOFT_SIGN_WORDS) + list(TS_WORDS.keys()) + list(E_WORDS.keys())
+):
+    _prefix = _word.replace("(", "").replace(")", "")[:_EXCEPTION_PREFIX_LENGTH]
+    _EXCEPTION_WORDS_BY_PREFIX.setdefault(_prefix, []).append(_index)
+
+_WORD_START_RE = re.compile(rf"\b\w{{{_EXCEPTION_PREFIX_LENGTH}}}", flags=re.U)
+
+_COMPOUNDS_FIRST_RE = re.compile(rf"({'|'.join(COMPOUNDS_FIRST.keys())})", flags=re.U)
+_COMPOUNDS_SECOND_RE = re.compile(rf"({'|'.join(COMPOUNDS_SECOND.keys())})", flags=re.U)
+_LATIN_BEGINNING_RE = re.compile(
+    rf"\b({'|'.join(LATIN_BEGINNING_RULES.keys())})", flags=re.U
+)
+_LATIN_AFTER_VOWEL_RE = re.compile(
+    r"({})({})".format("|".join(LATIN_VOWELS), "|".join(LATIN_AFTER_VOWEL_RULES.keys())),
+    flags=re.U,
+)
+_LATIN_TO_CYRILLIC_TABLE = str.maketrans(LATIN_TO_CYRILLIC)
+
+
+def _apply_exception_words(text):
+    """
+    Apply the exception word substitutions.
+
+    A substitution only ever turns latin letters into cyrillic ones, so it can
+    remove matches for the words after it but never create new ones. That lets
+    one scan over the word starts pick the candidate words; only those are then
+    substituted, in the original order.
+    """
+    candidates = set()
+    for m in _WORD_START_RE.finditer(text):
+        for index in _EXCEPTION_WORDS_BY_PREFIX.get(m.group(), ()):
+            if _EXCEPTION_WORDS[index][0].match(text, m.start()):
+                candidates.add(index)
+
+    for index in sorted(candidates):
+        pattern, replace = _EXCEPTION_WORDS[index]
+        text = pattern.sub(replace, text)
+    return text
+
+
 def to_cyrillic(text):
     """Transliterate latin text to cyrillic  using the following rules:
     1. ye = е in the beginning of a word or after a vowel
@@ -1290,143 +1438,39 @@ def to_cyrillic(text):
     3. ц exception words
     4. э exception words
     """
-    # These compounds must be converted before other letters
-    compounds_first = {
-        "ch": "ч",
-        "Ch": "Ч",
-        "CH": "Ч",
-        # this line must come before 's' because it has an 'h'
-        "sh": "ш",
-        "Sh": "Ш",
-        "SH": "Ш",
-        # This line must come before 'yo' because of it's apostrophe
-        "yo‘": "йў",
-        "Yo‘": "Йў",
-        "YO‘": "ЙЎ",
-    }
-    compounds_second = {
-        "yo": "ё",
-        "Yo": "Ё",
-        "YO": "Ё",
-        # 'ts': 'ц', 'Ts': 'Ц', 'TS': 'Ц',  # No need for this, see TS_WORDS
-        "yu": "ю",
-        "Yu": "Ю",
-        "YU": "Ю",
-        "ya": "я",
-        "Ya": "Я",
-        "YA": "Я",
-        "ye": "е",
-        "Ye": "Е",
-        "YE": "Е",
-        # different kinds of apostrophes
-        "o‘": "ў",
-        "O‘": "Ў",
-        "oʻ": "ў",
-        "Oʻ": "Ў",
-        "g‘": "ғ",
-        "G‘": "Ғ",
-        "gʻ": "ғ",
-        "Gʻ": "Ғ",
-    }
-    beginning_rules = {
-        "ye": "е",
-        "Ye": "Е",
-        "YE": "Е",
-        "e": "э",
-        "E": "Э",
-    }
-    after_vowel_rules = {
-        "ye": "е",
-        "Ye": "Е",
-        "YE": "Е",
-        "e": "э",
-        "E": "Э",
-    }
-    exception_words_rules = {
-        "s": "ц",
-        "S": "Ц",
-        "ts": "ц",
-        "Ts": "Ц",
-        "TS": "Ц",  # but not tS
-        "e": "э",
-        "E": "э",
-        "sh": "сҳ",
-        "Sh": "Сҳ",
-        "SH": "СҲ",
-        "yo": "йо",
-        "Yo": "Йо",
-        "YO": "ЙО",
-        "yu": "йу",
-        "Yu": "Йу",
-        "YU": "ЙУ",
-        "ya": "йа",
-        "Ya": "Йа",
-        "YA": "ЙА",
-    }
-
     # standardize some characters
     # the first one is the windows string, the second one is the mac string
     text = text.replace("ʻ", "‘")
 
-    def replace_soft_sign_words(m):
-        word = m.group(1)
-        if word.isupper():
-            result = SOFT_SIGN_WORDS[word.lower()].upper()
-        elif word[0].isupper():
-            result = SOFT_SIGN_WORDS[word.lower()]
-            result = result[0].upper() + result[1:]
-        else:
-            result = SOFT_SIGN_WORDS[word.lower()]
-        return result
-
-    for word in SOFT_SIGN_WORDS:
-        text = re.sub(rf"\b({word})", replace_soft_sign_words, text, flags=re.U)
-
-    def replace_exception_words(m):
-        """Replace ц (or э) only leaving other characters unchanged"""
-        return f"{m.group(1)[: m.start(2)]}{exception_words_rules[m.group(2)]}{m.group(1)[m.end(2) :]}"
-
-    # loop because of python's limit of 100 named groups
-    for word in list(TS_WORDS.keys()) + list(E_WORDS.keys()):
-        text = re.sub(rf"\b({word})", replace_exception_words, text, flags=re.U)
+    text = _apply_exception_words(text)
 
     # compounds
-    text = re.sub(
-        rf"({'|'.join(compounds_first.keys())})",
-        lambda x: compounds_first[x.group(1)],
-        text,
-        flags=re.U,
-    )
+    text = _COMPOUNDS_FIRST_RE.sub(lambda x: COMPOUNDS_FIRST[x.group(1)], text)
+    text = _COMPOUNDS_SECOND_RE.sub(lambda x: COMPOUNDS_SECOND[x.group(1)], text)
 
-    text = re.sub(
-        rf"({'|'.join(compounds_second.keys())})",
-        lambda x: compounds_second[x.group(1)],
-        text,
-        flags=re.U,
+    text = _LATIN_BEGINNING_RE.sub(lambda x: LATIN_BEGINNING_RULES[x.group(1)], text)
+    text = _LATIN_AFTER_VOWEL_RE.sub(
+        lambda x: f"{x.group(1)}{LATIN_AFTER_VOWEL_RULES[x.group(2)]}", text
     )
 
-    text = re.sub(
-        rf"\b({'|'.join(beginning_rules.keys())})",
-        lambda x: beginning_rules[x.group(1)],
-        text,
-        flags=re.U,
-    )
+    return text.translate(_LATIN_TO_CYRILLIC_TABLE)
 
-    text = re.sub(
-        r"({})({})".format("|".join(LATIN_VOWELS), "|".join(after_vowel_rules.keys())),
-        lambda x: f"{x.group(1)}{after_vowel_rules[x.group(2)]}",
-        text,
-        flags=re.U,
-    )
 
-    text = re.sub(
-        rf"({'|'.join(LATIN_TO_CYRILLIC.keys())})",
-        lambda x: LATIN_TO_CYRILLIC[x.group(1)],
-        text,
-        flags=re.U,
-    )
+# Rules used by to_latin
+CYRILLIC_BEGINNING_RULES = {"ц": "s", "Ц": "S", "е": "ye", "Е": "Ye"}
+CYRILLIC_AFTER_VOWEL_RULES = {"ц": "ts", "Ц": "Ts", "е": "ye", "Е": "Ye"}
 
-    return text
+_MONTHS_RE = re.compile(r"(сент|окт)([яЯ])(бр)", flags=re.IGNORECASE | re.U)
+_CYRILLIC_BEGINNING_RE = re.compile(
+    rf"\b({'|'.join(CYRILLIC_BEGINNING_RULES.keys())})", flags=re.U
+)
+_CYRILLIC_AFTER_VOWEL_RE = re.compile(
+    r"({})({})".format(
+        "|".join(CYRILLIC_VOWELS), "|".join(CYRILLIC_AFTER_VOWEL_RULES.keys())
+    ),
+    flags=re.U,
+)
+_CYRILLIC_TO_LATIN_TABLE = str.maketrans(CYRILLIC_TO_LATIN)
 
 
 def to_latin(text):
@@ -1442,46 +1486,49 @@ def to_latin(text):
     е = e in the middle of a word after a consonant (DEFAULT).
     3. Сентябр = Sentabr, Октябр = Oktabr
     """
-    beginning_rules = {"ц": "s", "Ц": "S", "е": "ye", "Е": "Ye"}
-    after_vowel_rules = {"ц": "ts", "Ц": "Ts", "е": "ye", "Е": "Ye"}
-
-    text = re.sub(
-        r"(сент|окт)([яЯ])(бр)",
+    text = _MONTHS_RE.sub(
         lambda x: "{}{}{}".format(
             x.group(1), "a" if x.group(2) == "я" else "A", x.group(3)
         ),
         text,
-        flags=re.IGNORECASE | re.U,
     )
 
-    text = re.sub(
-        rf"\b({'|'.join(beginning_rules.keys())})",
-        lambda x: beginning_rules[x.group(1)],
-        text,
-        flags=re.U,
+    text = _CYRILLIC_BEGINNING_RE.sub(
+        lambda x: CYRILLIC_BEGINNING_RULES[x.group(1)], text
     )
 
-    text = re.sub(
-        r"({})({})".format(
-            "|".join(CYRILLIC_VOWELS), "|".join(after_vowel_rules.keys())
-        ),
-        lambda x: f"{x.group(1)}{after_vowel_rules[x.group(2)]}",
-        text,
-        flags=re.U,
+    text = _CYRILLIC_AFTER_VOWEL_RE.sub(
+        lambda x: f"{x.group(1)}{CYRILLIC_AFTER_VOWEL_RULES[x.group(2)]}", text
     )
 
-    text = re.sub(
-        rf"({'|'.join(CYRILLIC_TO_LATIN.keys())})",
-        lambda x: CYRILLIC_TO_LATIN[x.group(1)],
-        text,
-        flags=re.U,
-    )
-
-    return text
+    return text.translate(_CYRILLIC_TO_LATIN_TABLE)
 
 
 CYRILLIC = "cyrillic"
 LATIN = "latin"
+MIXED = "mixed"
+NEUTRAL = "neutral"
+
+_CYRILLIC_CHARS = frozenset(CYRILLIC_TO_LATIN)
+# Latin letters plus the apostrophes that to_cyrillic folds into ў / ғ / ъ.
+_LATIN_CHARS = frozenset(string.ascii_letters) | frozenset("‘ʻʼ")
+
+
+def detect_script(text):
+    """
+    Classify `text` as LATIN, CYRILLIC, MIXED or NEUTRAL (nothing to
+    transliterate, e.g. digits and punctuation only).
+    """
+    chars = set(text)
+    has_cyrillic = not chars.isdisjoint(_CYRILLIC_CHARS)
+    has_latin = not chars.isdisjoint(_LATIN_CHARS)
+    if has_cyrillic and has_latin:
+        return MIXED
+    if has_cyrillic:
+        return CYRILLIC
+    if has_latin:
+        return LATIN
+    return NEUTRAL
 
 
 def transliterate(text, to_variant):
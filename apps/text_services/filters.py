@@ -1,4 +1,5 @@
 import operator
+import re
 from functools import reduce
 
 from django.conf import settings
@@ -16,18 +17,51 @@ def distinct(queryset, base):
     return queryset.distinct()
 
 
+# Lookups that can match several variants with one regex predicate.
+REGEX_LOOKUPS = {
+    "icontains": "{}",
+    "istartswith": "^(?:{})",
+    "iexact": "^(?:{})$",
+}
+
+
 class MultiSymbolSearchFilter(SearchFilter):
+    latin_processor = QLatinCyrillicProcessor(cyrillic_latin_translator.LATIN)
+    cyrillic_processor = QLatinCyrillicProcessor(cyrillic_latin_translator.CYRILLIC)
+
+    @classmethod
+    def term_variants(cls, term: str) -> list[str]:
+        """
+        Spellings of `term` worth searching for. Only the transliterations
+        that can actually differ from `term` are computed; duplicates dropped.
+        """
+        script = cyrillic_latin_translator.detect_script(term)
+        if script == cyrillic_latin_translator.NEUTRAL:
+            return [term]
+        if script == cyrillic_latin_translator.LATIN:
+            variants = [term, cls.cyrillic_processor.process(term)]
+        elif script == cyrillic_latin_translator.CYRILLIC:
+            variants = [cls.latin_processor.process(term), term]
+        else:
+            variants = [
+                cls.latin_processor.process(term),
+                cls.cyrillic_processor.process(term),
+            ]
+        return list(dict.fromkeys(variants))
+
     @staticmethod
-    def process_terms(
-        processor: QLatinCyrillicProcessor, terms: list[str], orm_lookups: list[str]
-    ) -> list[Q]:
-        joined_terms = " ".join(terms)
-        processed_terms = processor.process(joined_terms).split(" ")
-        return [
-            Q(**{orm_lookup: term})
-            for term in processed_terms
-            for orm_lookup in orm_lookups
-        ]
+    def variants_condition(orm_lookup: str, variants: list[str]) -> Q:
+        """One predicate matching any of `variants` where the lookup allows it."""
+        if len(variants) == 1:
+            return Q(**{orm_lookup: variants[0]})
+
+        field, _, lookup = orm_lookup.rpartition("__")
+        if lookup in REGEX_LOOKUPS:
+            alternatives = "|".join(re.escape(variant) for variant in variants)
+            return Q(**{f"{field}__iregex": REGEX_LOOKUPS[lookup].format(alternatives)})
+        if lookup == "exact":
+            return Q(**{f"{field}__in": variants})
+        return reduce(operator.or_, [Q(**{orm_lookup: variant}) for variant in variants])
 
     def filter_queryset(self, request, queryset, view):
         search_fields = self.get_search_fields(view, request)
@@ -36,26 +70,20 @@ class MultiSymbolSearchFilter(SearchFilter):
         if not search_fields or not search_terms:
             return queryset
 
-        latin_processor = QLatinCyrillicProcessor(cyrillic_latin_translator.LATIN)
-        cyrillic_processor = QLatinCyrillicProcessor(cyrillic_latin_translator.CYRILLIC)
-
         orm_lookups = [
-            self.construct_search(str(search_field)) for search_field in search_fields
+            self.construct_search(str(search_field), queryset)
+            for search_field in search_fields
         ]
         base = queryset
-        latin_conditions = self.process_terms(
-            latin_processor, search_terms, orm_lookups
-        )
-        cyrillic_conditions = self.process_terms(
-            cyrillic_processor, search_terms, orm_lookups
-        )
-
-        combined_latin_conditions = reduce(operator.and_, latin_conditions)
-        combined_cyrillic_conditions = reduce(operator.and_, cyrillic_conditions)
-
-        queryset = queryset.filter(
-            Q(combined_latin_conditions) | Q(combined_cyrillic_conditions)
-        )
+        conditions = []
+        for term in search_terms:
+            variants = self.term_variants(term)
+            conditions.extend(
+                self.variants_condition(orm_lookup, variants)
+                for orm_lookup in orm_lookups
+            )
+
+        queryset = queryset.filter(reduce(operator.and_, conditions))
         if self.must_call_distinct(queryset, search_fields):
             queryset = distinct(queryset, base)
 
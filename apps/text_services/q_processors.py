@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 
 from . import cyrillic_latin_translator
+from .transliteration_cache import transliterate
 
 
 class QProcessorBase(ABC):
@@ -17,10 +18,24 @@ class QProcessorBase(ABC):
 class QLatinCyrillicProcessor(QProcessorBase):
     """
     Convert `text` to latin or cyrillic characters depending on which characters are used in `text`.
+    Results are memoized, see `transliteration_cache`.
     """
 
     def __init__(self, to):
         self.to = to
 
     def process(self, text: str) -> str:
-        return cyrillic_latin_translator.transliterate(text, self.to)
+        return transliterate(text, self.to)
+
+
+class QSearchNormalizer(QProcessorBase):
+    """
+    Normalize `text` for the search shadow columns: transliterate it to one
+    script and lowercase it, so stored values and queries compare directly.
+    """
+
+    def __init__(self, to=cyrillic_latin_translator.LATIN):
+        self.to = to
+
+    def process(self, text: str) -> str:
+        return transliterate(text, self.to).lower()
@@ -0,0 +1,123 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.common.services.stats_log import StatsLogger
+
+from . import cyrillic_latin_translator
+
+
+class TransliterationCache:
+    """
+    Bounded, thread-safe LRU cache in front of cyrillic_latin_translator.transliterate.
+
+    Entries are keyed by (direction, text). When `use_redis` is on, misses are
+    looked up in the shared django cache before transliterating, so workers reuse
+    each other's results. Texts longer than `max_length` (item descriptions and
+    the like) bypass both tiers so they can't evict hot search terms. The
+    counters of stats() are logged every `stats_interval` seconds.
+    """
+
+    REDIS_KEY_PREFIX = "translit"
+
+    def __init__(self, maxsize=4096, max_length=64, use_redis=False, redis_timeout=24 * 60 * 60, stats_interval=0):
+        self.maxsize = maxsize
+        self.max_length = max_length
+        self.use_redis = use_redis
+        self.redis_timeout = redis_timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.redis_hits = 0
+        self.bypassed = 0
+        self.stats_logger = StatsLogger("transliteration_cache", self, stats_interval)
+
+    def transliterate(self, text, to_variant):
+        self.stats_logger.tick()
+        if len(text) > self.max_length:
+            with self._lock:
+                self.bypassed += 1
+            return cyrillic_latin_translator.transliterate(text, to_variant)
+
+        key = (to_variant, text)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        result = self._get_shared(key)
+        if result is None:
+            result = cyrillic_latin_translator.transliterate(text, to_variant)
+            self._set_shared(key, result)
+
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return result
+
+    def _redis_key(self, key):
+        to_variant, text = key
+        digest = hashlib.sha1(text.encode()).hexdigest()
+        return f"{self.REDIS_KEY_PREFIX}:{to_variant}:{digest}"
+
+    def _get_shared(self, key):
+        if not self.use_redis:
+            return None
+        try:
+            result = cache.get(self._redis_key(key))
+        except Exception:
+            return None
+        if result is not None:
+            with self._lock:
+                self.redis_hits += 1
+        return result
+
+    def _set_shared(self, key, result):
+        if not self.use_redis:
+            return
+        try:
+            cache.set(self._redis_key(key), result, timeout=self.redis_timeout)
+        except Exception:
+            pass
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.redis_hits = self.bypassed = 0
+
+    def stats(self):
+        """Counters for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "redis_hits": self.redis_hits,
+                "bypassed": self.bypassed,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+transliteration_cache = TransliterationCache(
+    maxsize=getattr(settings, "TRANSLITERATION_CACHE_SIZE", 4096),
+    max_length=getattr(settings, "TRANSLITERATION_CACHE_MAX_LENGTH", 64),
+    use_redis=getattr(settings, "TRANSLITERATION_CACHE_USE_REDIS", False),
+    redis_timeout=getattr(settings, "TRANSLITERATION_CACHE_TIMEOUT", 24 * 60 * 60),
+    stats_interval=getattr(settings, "CACHE_STATS_LOG_INTERVAL", 0),
+)
+
+
+def transliterate(text, to_variant):
+    return transliteration_cache.transliterate(text, to_variant)
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with PASSWORD_PBKDF2_ITERATIONS; same algorithm name, so existing hashes verify."""
+
+    iterations = getattr(settings, "PASSWORD_PBKDF2_ITERATIONS", hashers.PBKDF2PasswordHasher.iterations)
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Argon2id with the PASSWORD_ARGON2_* work factors. Needs argon2-cffi."""
+
+    time_cost = getattr(settings, "PASSWORD_ARGON2_TIME_COST", hashers.Argon2PasswordHasher.time_cost)
+    memory_cost = getattr(settings, "PASSWORD_ARGON2_MEMORY_COST", hashers.Argon2PasswordHasher.memory_cost)
+    parallelism = getattr(settings, "PASSWORD_ARGON2_PARALLELISM", hashers.Argon2PasswordHasher.parallelism)
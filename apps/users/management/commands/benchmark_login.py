@@ -0,0 +1,91 @@
+import copy
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+
+WORK_FACTOR_ATTRS = ("iterations", "time_cost", "work_factor")
+PASSWORD = "benchmark-Passw0rd!"
+
+
+def verify_for(hasher, encoded, seconds):
+    """Number of password checks done in `seconds`."""
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        hasher.verify(PASSWORD, encoded)
+        count += 1
+    return count
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure password checks (the CPU cost of a login) per second per core for the "
+        "configured hasher or candidate work factors, and estimate login capacity."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seconds", type=float, default=3, help="Duration of each measurement.")
+        parser.add_argument(
+            "--processes", type=int, default=os.cpu_count() or 1,
+            help="Parallel processes for the multi-core measurement (default: all cores).",
+        )
+        parser.add_argument(
+            "--work-factors", type=int, nargs="*", default=[],
+            help="Candidate iterations (PBKDF2), time_cost (Argon2) or work_factor (scrypt) to compare.",
+        )
+        parser.add_argument("--workers", type=int, default=4, help="gunicorn workers for the estimate.")
+        parser.add_argument("--threads", type=int, default=2, help="gunicorn threads per worker for the estimate.")
+
+    def handle(self, *args, **options):
+        hasher = get_hasher("default")
+        attr = next((name for name in WORK_FACTOR_ATTRS if hasattr(hasher, name)), None)
+
+        candidates = [hasher]
+        if options["work_factors"]:
+            if attr is None:
+                self.stderr.write(f"{hasher.algorithm} has no tunable work factor, --work-factors ignored")
+            else:
+                candidates = []
+                for value in options["work_factors"]:
+                    candidate = copy.copy(hasher)
+                    setattr(candidate, attr, value)
+                    candidates.append(candidate)
+
+        cores = os.cpu_count() or 1
+        processes = max(1, options["processes"])
+        concurrency = min(options["workers"] * options["threads"], cores)
+        self.stdout.write(
+            f"{hasher.algorithm}, {cores} cores, {processes} processes, {options['seconds']}s per measurement"
+        )
+
+        for candidate in candidates:
+            label = f"{attr}={getattr(candidate, attr)}" if attr else "defaults"
+            encoded = candidate.encode(PASSWORD, candidate.salt())
+
+            single = verify_for(candidate, encoded, options["seconds"]) / options["seconds"]
+            per_core = single
+            if processes > 1:
+                parallel = self.measure_parallel(candidate, encoded, options["seconds"], processes)
+                per_core = parallel / min(processes, cores)
+                scaling = f", {processes} processes {parallel:.1f}/s ({per_core:.1f} per core)"
+            else:
+                scaling = ""
+
+            self.stdout.write(
+                f"  {label}: {single:.1f} logins/s on one core ({1000 / single:.0f} ms each){scaling}; "
+                f"~{per_core * concurrency:.0f} logins/s for {options['workers']} workers x "
+                f"{options['threads']} threads"
+            )
+        self.stdout.write(self.style.SUCCESS("done."))
+
+    @staticmethod
+    def measure_parallel(hasher, encoded, seconds, processes):
+        # fork keeps the configured Django settings in the children
+        context = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(max_workers=processes, mp_context=context) as pool:
+            counts = pool.map(verify_for, [hasher] * processes, [encoded] * processes, [seconds] * processes)
+            return sum(counts) / seconds
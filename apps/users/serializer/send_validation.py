@@ -52,13 +52,8 @@ class SendValidationSerializer(serializers.Serializer):
                 expires_in=48 * 60 * 60
             )
 
-            email_sent = send_validation_email(email, validation_link, deletion_link)
-
-            if not email_sent:
-                user.delete()
-                raise serializers.ValidationError(
-                    "Failed to send verification email. Please try again later."
-                )
+            # Sent by a Celery worker after commit; a mail failure is retried there
+            send_validation_email(email, validation_link, deletion_link)
 
             return {
                 "detail": f"Verification link has been sent to {email}. Please check your email to verify your account.",
@@ -66,8 +61,6 @@ class SendValidationSerializer(serializers.Serializer):
             }
 
         except Exception as e:
-            if 'user' in locals():
-                user.delete()
             raise serializers.ValidationError(f"Account creation failed: {str(e)}")
 
 
@@ -3,11 +3,14 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken
 from rest_framework_simplejwt.settings import api_settings
 
+from apps.users.services.user_cache import user_auth_cache
+
 
 class CustomJWTAuthentication(JWTAuthentication):
     """
     Custom JWT Authentication that checks for soft deleted users.
     If a user is soft deleted, authentication will fail with appropriate error.
+    Users are resolved through user_auth_cache, not queried per request.
     """
 
     def get_user(self, validated_token):
@@ -20,9 +23,8 @@ class CustomJWTAuthentication(JWTAuthentication):
         except KeyError:
             raise InvalidToken('Token contained no recognizable user identification')
 
-        try:
-            user = self.user_model.objects.get(**{api_settings.USER_ID_FIELD: user_id})
-        except self.user_model.DoesNotExist:
+        user = user_auth_cache.get(user_id)
+        if user is None:
             raise InvalidToken('User not found')
 
         if getattr(user, 'is_deleted', False):
@@ -31,6 +33,18 @@ class CustomJWTAuthentication(JWTAuthentication):
         return user
 
 
+class StatelessJWTAuthentication(CustomJWTAuthentication):
+    """
+    For views that only need the user id: request.user is a TokenUser built
+    from the token claims and views never load a User. Soft deleted users are
+    still rejected through user_auth_cache.
+    """
+
+    def get_user(self, validated_token):
+        super().get_user(validated_token)
+        return api_settings.TOKEN_USER_CLASS(validated_token)
+
+
 class SoftDeleteCheckMixin:
     """
     Mixin class to check for soft deleted users in views.
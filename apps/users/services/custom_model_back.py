@@ -13,10 +13,14 @@ class EmailOrUsernameModelBackend:
                 Q(email__iexact=username) | Q(username__iexact=username)
             )
         except UserModel.DoesNotExist:
+            # Hash anyway, so unknown logins take as long as known ones
+            UserModel().set_password(password)
             return None
         except UserModel.MultipleObjectsReturned:
+            UserModel().set_password(password)
             return None
 
+        # check_password rehashes and saves the password when PASSWORD_HASHERS changed
         if user.check_password(password) and self.user_can_authenticate(user):
             return user
         return None
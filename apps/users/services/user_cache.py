@@ -0,0 +1,170 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.users.models import User
+
+logger = logging.getLogger(__name__)
+
+
+class UserAuthCache:
+    """
+    Cache of the users resolved by JWT authentication.
+
+    Every user has an auth version stamp in the shared cache (Redis); saving
+    or deleting the user bumps it (see apps.users.signals). Cached users are
+    keyed by (id, version) in a process-local LRU and in Redis, so a request
+    costs one Redis GET for the stamp and no SQL while the entry is fresh,
+    and soft deletion, password or profile changes take effect on the next
+    request in every worker. The password hash is never cached: it is left
+    deferred and loaded on first access. When Redis is unavailable users are
+    read from the database and a failed bump only clears this worker's copy;
+    other workers' copies then expire after `timeout`.
+    """
+
+    VERSION_KEY = "users:auth_version:{user_id}"
+    USER_KEY = "users:auth:{user_id}:{version}"
+    EXCLUDED_FIELDS = ("password",)
+
+    def __init__(self, maxsize=10000, timeout=5 * 60):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.redis_hits = 0
+        self.fallbacks = 0
+
+    @property
+    def fields(self):
+        return [field for field in User._meta.concrete_fields if field.attname not in self.EXCLUDED_FIELDS]
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    @staticmethod
+    def _new_version():
+        # Time based, so a stamp lost from Redis never comes back with an old value
+        return time.time_ns() // 1000
+
+    def _version(self, user_id):
+        key = self.VERSION_KEY.format(user_id=user_id)
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, self._new_version(), timeout=None)
+            version = cache.get(key)
+        return version
+
+    def bump(self, user_id):
+        """Invalidate every cached copy of the user."""
+        key = self.VERSION_KEY.format(user_id=user_id)
+        try:
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.add(key, self._new_version(), timeout=None)
+        except Exception:
+            # Runs after commit: a cache outage must not fail the request
+            logger.warning("Could not bump the auth version of user %s", user_id, exc_info=True)
+            self._count("fallbacks")
+            with self._lock:
+                for entry_key in [entry_key for entry_key in self._entries if entry_key[0] == str(user_id)]:
+                    del self._entries[entry_key]
+
+    def _dump(self, user):
+        values = {}
+        for field in self.fields:
+            value = field.value_from_object(user)
+            values[field.attname] = None if value is None else field.value_to_string(user)
+        return values
+
+    def _load(self, values):
+        fields = self.fields
+        return User.from_db(
+            "default",
+            [field.attname for field in fields],
+            [None if values[field.attname] is None else field.to_python(values[field.attname]) for field in fields],
+        )
+
+    def get_values(self, user_id):
+        """Field values of the user as stored in the cache, or None if there is no such user."""
+        user_id = str(user_id)
+        try:
+            version = self._version(user_id)
+        except Exception:
+            self._count("fallbacks")
+            user = User.objects.filter(pk=user_id).first()
+            return None if user is None else self._dump(user)
+
+        key = (user_id, version)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        redis_key = self.USER_KEY.format(user_id=user_id, version=version)
+        try:
+            values = cache.get(redis_key)
+        except Exception:
+            self._count("fallbacks")
+            values = None
+            redis_key = None
+        if values is not None:
+            self._count("redis_hits")
+        else:
+            user = User.objects.filter(pk=user_id).first()
+            if user is None:
+                return None
+            values = self._dump(user)
+            if redis_key is not None:
+                try:
+                    cache.set(redis_key, values, timeout=self.timeout)
+                except Exception:
+                    self._count("fallbacks")
+
+        with self._lock:
+            self._entries[key] = (now + self.timeout, values)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return values
+
+    def get(self, user_id):
+        """A fresh User instance for every call, or None if there is no such user."""
+        values = self.get_values(user_id)
+        return None if values is None else self._load(values)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.redis_hits = self.fallbacks = 0
+
+    def stats(self):
+        """Counters for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "redis_hits": self.redis_hits,
+                "fallbacks": self.fallbacks,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+user_auth_cache = UserAuthCache(
+    maxsize=getattr(settings, "USER_AUTH_CACHE_SIZE", 10000),
+    timeout=getattr(settings, "USER_AUTH_CACHE_TIMEOUT", 5 * 60),
+)
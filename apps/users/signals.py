@@ -0,0 +1,17 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.users.models import User
+from apps.users.services.user_cache import user_auth_cache
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def bump_auth_version(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login, which authentication does not depend on
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return
+    transaction.on_commit(partial(user_auth_cache.bump, instance.pk), robust=True)
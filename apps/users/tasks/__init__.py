@@ -0,0 +1 @@
+from .send_mail import send_user_email  # noqa
@@ -1,94 +1,121 @@
+import logging
+import smtplib
+from functools import cache, partial
+
+from celery import Task, shared_task
 from django.conf import settings
 from django.core.mail import EmailMultiAlternatives
-
+from django.db import transaction
+from django.template.base import TextNode, Variable, VariableNode
+from django.template.defaulttags import AutoEscapeControlNode
+from django.template.loader import get_template, render_to_string
+from django.utils.html import conditional_escape
+from django.utils.translation import get_language
+
+from apps.common.services.mail import mail_connections
 from apps.common.tasks.send_mail_task import send_email_task
+from apps.users.models import User
 from apps.users.services.user_services import UserService
 
+logger = logging.getLogger(__name__)
+
+EMAIL_SUBJECTS = {
+    "validation": {
+        "en": "Welcome to mNews – Verify Your Email",
+        "uz": "mNews'ga xush kelibsiz – emailingizni tasdiqlang",
+        "ru": "Добро пожаловать в mNews – подтвердите email",
+    },
+    "password_reset": {
+        "en": "mNews – Password Reset Request",
+        "uz": "mNews – parolni tiklash so'rovi",
+        "ru": "mNews – запрос на сброс пароля",
+    },
+}
+
+
+def email_language(language: str | None = None) -> str:
+    """`language` if it is one of LANGUAGES, else LANGUAGE_CODE."""
+    language = (language or "").split("-")[0]
+    return language if language in dict(settings.LANGUAGES) else settings.LANGUAGE_CODE
+
+
+@cache
+def compile_email_template(template_name: str) -> list | None:
+    """
+    The template as a list of literal strings and (variable, autoescape)
+    pairs, or None if it uses anything besides plain {{ variable }} and
+    {% autoescape %}. Built once per process from the parsed template.
+    """
+    parts = []
+
+    def walk(nodelist, autoescape):
+        for node in nodelist:
+            if isinstance(node, TextNode):
+                parts.append(node.s)
+            elif isinstance(node, AutoEscapeControlNode):
+                walk(node.nodelist, node.setting)
+            elif (
+                isinstance(node, VariableNode)
+                and not node.filter_expression.filters
+                and isinstance(node.filter_expression.var, Variable)
+                and node.filter_expression.var.lookups
+                and len(node.filter_expression.var.lookups) == 1
+            ):
+                parts.append((node.filter_expression.var.lookups[0], autoescape))
+            else:
+                raise TypeError(type(node).__name__)
+
+    try:
+        walk(get_template(template_name).template.nodelist, True)
+    except TypeError:
+        return None
+    return parts
 
-def send_validation_email(email: str, validation_link: str, deletion_link: str) -> bool:
+
+def render_email_template(template_name: str, context: dict) -> str:
+    """
+    Same output as render_to_string(), without the per-call template engine
+    work: the compiled parts are joined with the (escaped) context values.
+    """
+    parts = compile_email_template(template_name)
+    if parts is None:
+        return render_to_string(template_name, context)
+    rendered = []
+    for part in parts:
+        if isinstance(part, str):
+            rendered.append(part)
+        else:
+            name, autoescape = part
+            value = context.get(name, "")
+            rendered.append(conditional_escape(value) if autoescape else str(value))
+    return "".join(rendered)
+
+
+def build_email(name: str, email: str, language: str | None = None, **context) -> EmailMultiAlternatives:
     """
-    Send a verification email with validation and deletion links.
+    Build email `name` from templates/emails/<name>.<language>.txt and .html.
+    The HTML templates already have the layout and inlined CSS (see
+    manage.py build_email_templates); both are compiled once per process
+    (compile_email_template) and rendered by joining strings.
 
     Args:
+        name: Template name, e.g. "validation"
         email: Recipient email address
-        validation_link: URL to verify the account
-        deletion_link: URL to cancel the account request
+        language: uz, ru or en; defaults to the active language
+        **context: Template variables
 
     Returns:
-        bool: True if email was sent successfully, False otherwise
-    """
-    subject = "Welcome to mNews – Verify Your Email"
-    from_email = settings.DEFAULT_FROM_EMAIL
-    recipient_list = [email]
-
-    # Plain text version
-    text_message = (
-        f"Welcome to mNews!\n\n"
-        f"To complete your registration, please verify your email address.\n\n"
-        f"Verify your account: {validation_link}\n"
-        f"Cancel account request: {deletion_link}\n\n"
-        f"If you did not request this registration, you can safely ignore this email."
-    )
-
-    # HTML version - more concise and maintainable
-    html_message = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    </head>
-    <body style="margin:0; padding:20px; font-family:Arial,sans-serif; background-color:#f4f4f4;">
-        <div style="max-width:600px; margin:0 auto; background-color:#ffffff; padding:30px; border-radius:8px; box-shadow:0 2px 4px rgba(0,0,0,0.1);">
-            <h2 style="color:#0073e6; margin-top:0;">Welcome to mNews!</h2>
-
-            <p style="color:#333; line-height:1.6; margin:20px 0;">
-                We received a request to create an account with this email address. 
-                Please confirm by verifying your email.
-            </p>
-
-            <table cellpadding="0" cellspacing="0" style="margin:30px 0;">
-                <tr>
-                    <td style="padding:12px 24px; background-color:#0073e6; border-radius:5px;">
-                        <a href="{validation_link}" style="color:#ffffff; text-decoration:none; font-weight:bold; display:block;">
-                            ✅ Verify My Email
-                        </a>
-                    </td>
-                </tr>
-            </table>
-
-            <p style="color:#333; line-height:1.6; margin:20px 0;">
-                If you did not request this account, you can cancel it:
-            </p>
-
-            <table cellpadding="0" cellspacing="0" style="margin:20px 0;">
-                <tr>
-                    <td style="padding:12px 24px; background-color:#cc0000; border-radius:5px;">
-                        <a href="{deletion_link}" style="color:#ffffff; text-decoration:none; font-weight:bold; display:block;">
-                            ❌ Cancel Account Request
-                        </a>
-                    </td>
-                </tr>
-            </table>
-
-            <hr style="margin:30px 0; border:none; border-top:1px solid #ddd;" />
-
-            <p style="font-size:12px; color:#777; line-height:1.4;">
-                This message was sent to {email} because someone used this address to sign up for mNews. 
-                If this was not you, simply ignore this email and no account will be created.
-            </p>
-        </div>
-    </body>
-    </html>
+        EmailMultiAlternatives: The message, not sent yet
     """
+    language = email_language(language or get_language())
+    context = {**context, "email": email, "language": language}
+    text_message = render_email_template(f"emails/{name}.{language}.txt", context)
+    html_message = render_email_template(f"emails/{name}.{language}.html", context)
+    subject = EMAIL_SUBJECTS[name][language]
 
-    try:
-        msg = EmailMultiAlternatives(subject, text_message, from_email, recipient_list)
-        msg.attach_alternative(html_message, "text/html")
-        msg.send(fail_silently=False)
-        return True
-    except Exception as e:
-        return False
+    msg = EmailMultiAlternatives(subject, text_message, settings.DEFAULT_FROM_EMAIL, [email])
+    msg.attach_alternative(html_message, "text/html")
+    return msg
 
 
 def send_welcome_email(email: str):
@@ -103,94 +130,59 @@ def send_welcome_email(email: str):
         pass
 
 
-def send_password_reset_email(email: str, reset_link: str) -> bool:
+class UserEmailTask(Task):
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        """
+        Runs once the email is given up on (retries exhausted or the address
+        refused). A signup whose verification email never arrived is removed,
+        so the address can sign up again.
+        """
+        kind, email = args[:2]
+        if kind == "validation":
+            deleted, _ = User.objects.filter(email=email, is_active=False, is_deleted=False).delete()
+            if deleted:
+                logger.warning("Verification email to %s failed (%r); removed the unverified account", email, exc)
+
+
+@shared_task(
+    base=UserEmailTask,
+    autoretry_for=(smtplib.SMTPException, OSError),
+    dont_autoretry_for=(smtplib.SMTPRecipientsRefused,),
+    retry_backoff=True,
+    retry_backoff_max=10 * 60,
+    retry_jitter=True,
+    max_retries=5,
+)
+def send_user_email(kind: str, email: str, **context):
     """
-    Send a password reset email with a secure link.
+    Render email `kind` (see EMAIL_SUBJECTS) and send it over the worker's
+    pooled connection. Transient SMTP and network errors are retried with
+    exponential backoff; see UserEmailTask.on_failure for what happens when
+    they run out.
+    """
+    message = build_email(kind, email, **context)
+    return mail_connections.send_messages([message])
 
-    Args:
-        email: Recipient email address
-        reset_link: URL to reset the password
 
-    Returns:
-        bool: True if email was sent successfully, False otherwise
+def queue_user_email(kind: str, email: str, **context):
+    """
+    Send the email from a Celery worker once the current transaction
+    commits, so the request never waits on SMTP. A broker error is logged,
+    not raised into the request.
     """
-    subject = "mNews – Password Reset Request"
-    from_email = settings.DEFAULT_FROM_EMAIL
-    recipient_list = [email]
-
-    text_message = (
-        f"Password Reset Request\n\n"
-        f"We received a request to reset your password for your mNews account.\n\n"
-        f"Click the link below to reset your password:\n"
-        f"{reset_link}\n\n"
-        f"This link will expire in 1 hour.\n\n"
-        f"If you did not request a password reset, please ignore this email. "
-        f"Your password will remain unchanged."
+    transaction.on_commit(partial(send_user_email.delay, kind, email, **context), robust=True)
+
+
+def send_validation_email(email: str, validation_link: str, deletion_link: str, language: str | None = None):
+    queue_user_email(
+        "validation", email,
+        validation_link=validation_link, deletion_link=deletion_link, language=language or get_language(),
     )
 
-    html_message = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    </head>
-    <body style="margin:0; padding:20px; font-family:Arial,sans-serif; background-color:#f4f4f4;">
-        <div style="max-width:600px; margin:0 auto; background-color:#ffffff; padding:30px; border-radius:8px; box-shadow:0 2px 4px rgba(0,0,0,0.1);">
-            <h2 style="color:#0073e6; margin-top:0;">Password Reset Request</h2>
-
-            <p style="color:#333; line-height:1.6; margin:20px 0;">
-                We received a request to reset your password for your <strong>mNews</strong> account.
-            </p>
-
-            <p style="color:#333; line-height:1.6; margin:20px 0;">
-                Click the button below to create a new password:
-            </p>
-
-            <table cellpadding="0" cellspacing="0" style="margin:30px 0;">
-                <tr>
-                    <td style="padding:14px 28px; background-color:#0073e6; border-radius:5px;">
-                        <a href="{reset_link}" style="color:#ffffff; text-decoration:none; font-weight:bold; font-size:16px; display:block;">
-                            🔒 Reset My Password
-                        </a>
-                    </td>
-                </tr>
-            </table>
-
-            <p style="color:#666; font-size:14px; line-height:1.6; margin:20px 0;">
-                <strong>Note:</strong> This link will expire in <strong>1 hour</strong> for security reasons.
-            </p>
-
-            <p style="color:#333; line-height:1.6; margin:20px 0;">
-                If the button doesn't work, copy and paste this link into your browser:
-            </p>
-
-            <p style="color:#0073e6; word-break:break-all; font-size:13px; background-color:#f8f8f8; padding:10px; border-radius:4px;">
-                {reset_link}
-            </p>
-
-            <hr style="margin:30px 0; border:none; border-top:1px solid #ddd;" />
-
-            <p style="font-size:12px; color:#777; line-height:1.4;">
-                If you did not request a password reset, please ignore this email. 
-                Your password will remain unchanged.
-            </p>
-
-            <p style="font-size:12px; color:#777; line-height:1.4;">
-                This email was sent to {email} in response to a password reset request.
-            </p>
-        </div>
-    </body>
-    </html>
-    """
 
-    try:
-        msg = EmailMultiAlternatives(subject, text_message, from_email, recipient_list)
-        msg.attach_alternative(html_message, "text/html")
-        msg.send(fail_silently=False)
-        return True
-    except Exception as e:
-        return False
+def send_password_reset_email(email: str, reset_link: str, language: str | None = None):
+    queue_user_email("password_reset", email, reset_link=reset_link, language=language or get_language())
+
 
 def send_reset_password_email(user):
     try:
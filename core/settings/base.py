@@ -20,6 +20,7 @@ DJANGO_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 LOCAL_APPS = [
@@ -40,7 +41,6 @@ EXTERNAL_APPS = [
     "drf_yasg",
     "django_recaptcha",
     "django_filters",
-    'corsheaders',
 ]
 
 INSTALLED_APPS = EXTERNAL_APPS + DJANGO_APPS + LOCAL_APPS
@@ -62,7 +62,6 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    'corsheaders.middleware.CorsMiddleware'
 ]
 
 CORS_ALLOW_ALL_ORIGINS = True
@@ -160,6 +159,29 @@ AUTH_PASSWORD_VALIDATORS = [
 
 AUTH_USER_MODEL = "users.User"
 
+# Password hashing
+# The first hasher hashes new passwords; hashes made by the others or with
+# different work factors are rehashed on the user's next successful login.
+# Measure candidates with `manage.py benchmark_login`.
+PASSWORD_HASH_ALGORITHM = os.getenv("PASSWORD_HASH_ALGORITHM", "pbkdf2_sha256")
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv("PASSWORD_PBKDF2_ITERATIONS", 1_000_000))
+# argon2 needs the argon2-cffi package
+PASSWORD_ARGON2_TIME_COST = int(os.getenv("PASSWORD_ARGON2_TIME_COST", 2))
+PASSWORD_ARGON2_MEMORY_COST = int(os.getenv("PASSWORD_ARGON2_MEMORY_COST", 102400))
+PASSWORD_ARGON2_PARALLELISM = int(os.getenv("PASSWORD_ARGON2_PARALLELISM", 8))
+
+_PASSWORD_HASHERS = {
+    "pbkdf2_sha256": "apps.users.hashers.PBKDF2PasswordHasher",
+    "argon2": "apps.users.hashers.Argon2PasswordHasher",
+    "pbkdf2_sha1": "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "bcrypt_sha256": "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "scrypt": "django.contrib.auth.hashers.ScryptPasswordHasher",
+}
+PASSWORD_HASHERS = [
+    _PASSWORD_HASHERS[PASSWORD_HASH_ALGORITHM],
+    *[hasher for algorithm, hasher in _PASSWORD_HASHERS.items() if algorithm != PASSWORD_HASH_ALGORITHM],
+]
+
 # Authentication backends
 AUTHENTICATION_BACKENDS = [
     'apps.users.services.custom_model_back.EmailOrUsernameModelBackend',
@@ -197,6 +219,50 @@ CACHES = {
     }
 }
 
+# SEARCH
+# Minimum pg_trgm similarity for fuzzy item search (`?fuzzy=1`)
+ITEM_SEARCH_TRIGRAM_THRESHOLD = float(os.getenv("ITEM_SEARCH_TRIGRAM_THRESHOLD", 0.3))
+# Lowest threshold a client may ask for with `?similarity=`; below it almost
+# every item becomes a candidate
+ITEM_SEARCH_TRIGRAM_MIN_THRESHOLD = float(os.getenv("ITEM_SEARCH_TRIGRAM_MIN_THRESHOLD", 0.1))
+
+# Memoization of search term transliteration (apps.text_services.transliteration_cache)
+TRANSLITERATION_CACHE_SIZE = int(os.getenv("TRANSLITERATION_CACHE_SIZE", 4096))
+TRANSLITERATION_CACHE_MAX_LENGTH = int(os.getenv("TRANSLITERATION_CACHE_MAX_LENGTH", 64))
+TRANSLITERATION_CACHE_USE_REDIS = os.getenv("TRANSLITERATION_CACHE_USE_REDIS", "False") == "True"
+
+# Seconds between the stats() log lines of in-process caches
+# (apps.common.services.stats_log), 0 disables them
+CACHE_STATS_LOG_INTERVAL = int(os.getenv("CACHE_STATS_LOG_INTERVAL", 5 * 60))
+
+# CATEGORIES
+# Lifetime of rendered category tree snapshots (apps.item.services.category_tree)
+CATEGORY_TREE_CACHE_TIMEOUT = int(os.getenv("CATEGORY_TREE_CACHE_TIMEOUT", 24 * 60 * 60))
+
+# REACTIONS
+# Buffered block views (apps.reaction.services.view_buffer)
+VIEW_BUFFER_BATCH_SIZE = int(os.getenv("VIEW_BUFFER_BATCH_SIZE", 1000))
+# Repeated views of a block by the same user within this many seconds count once
+VIEW_DEDUPE_WINDOW = int(os.getenv("VIEW_DEDUPE_WINDOW", 30 * 60))
+# Lifetime of per-user liked/bookmarked block sets (apps.reaction.services.reaction_cache)
+REACTION_CACHE_TIMEOUT = int(os.getenv("REACTION_CACHE_TIMEOUT", 24 * 60 * 60))
+# Block leaderboards (apps.reaction.services.leaderboard)
+LEADERBOARD_SIZE = int(os.getenv("LEADERBOARD_SIZE", 100))
+TRENDING_WINDOW_DAYS = int(os.getenv("TRENDING_WINDOW_DAYS", 14))
+TRENDING_HALF_LIFE_DAYS = float(os.getenv("TRENDING_HALF_LIFE_DAYS", 3))
+# Virtual reviews at the global mean added to every block's rating
+TRENDING_RATING_PRIOR = int(os.getenv("TRENDING_RATING_PRIOR", 5))
+# Entries kept per user by the prune_search_history task
+SEARCH_HISTORY_LIMIT = int(os.getenv("SEARCH_HISTORY_LIMIT", 100))
+
+# Lifetime of the cached anonymous block page (ItemBlockFullAPIView)
+ITEMBLOCK_FULL_CACHE_TIMEOUT = int(os.getenv("ITEMBLOCK_FULL_CACHE_TIMEOUT", 60))
+
+# USERS
+# Users resolved by JWT authentication (apps.users.services.user_cache)
+USER_AUTH_CACHE_SIZE = int(os.getenv("USER_AUTH_CACHE_SIZE", 10000))
+USER_AUTH_CACHE_TIMEOUT = int(os.getenv("USER_AUTH_CACHE_TIMEOUT", 5 * 60))
+
 # CELERY CONFIGURATION
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", f"redis://{REDIS_HOST}:{REDIS_PORT}")
 CELERY_RESULT_BACKEND = os.getenv(
@@ -207,6 +273,40 @@ CELERY_TIMEZONE = "Asia/Tashkent"
 
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60
+# Run tasks in-process (local development without a worker)
+CELERY_TASK_ALWAYS_EAGER = os.getenv("CELERY_TASK_ALWAYS_EAGER", "False") == "True"
+
+CELERY_BEAT_SCHEDULE = {
+    "reconcile-block-stats": {
+        "task": "apps.reaction.tasks.block_stats.reconcile_block_stats",
+        "schedule": timedelta(hours=int(os.getenv("BLOCK_STATS_RECONCILE_HOURS", 1))),
+    },
+    "flush-view-buffer": {
+        "task": "apps.reaction.tasks.views.flush_view_buffer",
+        "schedule": timedelta(seconds=int(os.getenv("VIEW_BUFFER_FLUSH_SECONDS", 30))),
+    },
+    "compute-leaderboards": {
+        "task": "apps.reaction.tasks.leaderboard.compute_leaderboards",
+        "schedule": timedelta(minutes=int(os.getenv("LEADERBOARD_COMPUTE_MINUTES", 15))),
+    },
+    "drain-mail-queue": {
+        "task": "apps.common.tasks.mail_dispatch.drain_mail_queue",
+        "schedule": timedelta(seconds=int(os.getenv("MAIL_QUEUE_DRAIN_SECONDS", 10))),
+    },
+    "prune-search-history": {
+        "task": "apps.reaction.tasks.search_history.prune_search_history",
+        "schedule": timedelta(hours=int(os.getenv("SEARCH_HISTORY_PRUNE_HOURS", 6))),
+    },
+}
+
+# LOGGING
+# apps.* loggers (cache stats, dropped events, ...) go to the console
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {"apps": {"handlers": ["console"], "level": os.getenv("APPS_LOG_LEVEL", "INFO")}},
+}
 
 # CYPHER CONFIGURATION
 # AES
@@ -261,6 +361,15 @@ EMAIL_USE_SSL = os.getenv("EMAIL_USE_SSL", "False") == "True"
 EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
 DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "webmaster@localhost")
+# Seconds an SMTP connect or command may block; a hung server fails the send
+EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT", 30))
+# Seconds a worker keeps reusing one SMTP connection (apps.common.services.mail)
+EMAIL_CONNECTION_MAX_AGE = int(os.getenv("EMAIL_CONNECTION_MAX_AGE", 60))
+# Bulk email queue (apps.common.services.mail_dispatcher)
+MAIL_QUEUE_BATCH_SIZE = int(os.getenv("MAIL_QUEUE_BATCH_SIZE", 200))
+# Messages per recipient domain per minute, 0 disables the limit
+MAIL_DOMAIN_RATE_LIMIT = int(os.getenv("MAIL_DOMAIN_RATE_LIMIT", 300))
+MAIL_MAX_ATTEMPTS = int(os.getenv("MAIL_MAX_ATTEMPTS", 5))
 
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",
@@ -0,0 +1,12 @@
+from .base import *  # noqa
+
+# Settings for the pytest suite (see [tool.pytest.ini_options]). The
+# database still comes from DB_* in the environment; everything else runs
+# in-process, so no Redis, SMTP server or Celery worker is needed.
+SECRET_KEY = os.getenv("DJANGO_SECRET_KEY") or "test-secret-key"  # noqa: F405
+SIMPLE_JWT = {**SIMPLE_JWT, "SIGNING_KEY": SECRET_KEY}  # noqa: F405
+
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+CELERY_TASK_ALWAYS_EAGER = True
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
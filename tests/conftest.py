@@ -0,0 +1,14 @@
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Cached snapshots must not leak from one test into the next."""
+    cache.clear()
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
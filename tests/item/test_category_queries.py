@@ -0,0 +1,62 @@
+"""
+Every category list endpoint runs a fixed number of queries, whatever the
+page size: child_count, item_count and is_leaf come from the annotations of
+CategoryService.with_counts(), not from a query per row.
+"""
+import pytest
+from django.urls import reverse
+
+from apps.item.models import Category, Item
+
+pytestmark = pytest.mark.django_db
+
+# SAVEPOINT/RELEASE of ATOMIC_REQUESTS, COUNT(*) of the paginator, the page
+LIST_QUERIES = 4
+# ... plus the lookup of the category by slug
+RELATED_QUERIES = 5
+
+
+@pytest.fixture
+def category_tree():
+    """Five roots with three children each, and two leaves with an item under every child."""
+    for r in range(5):
+        root = Category.objects.create(title=f"Root {r}")
+        for c in range(3):
+            child = Category.objects.create(title=f"Child {r}.{c}", parent=root)
+            for leaf_index in range(2):
+                leaf = Category.objects.create(title=f"Leaf {r}.{c}.{leaf_index}", parent=child)
+                Item.objects.create(title=f"Item {r}.{c}.{leaf_index}", category=leaf)
+
+
+@pytest.mark.parametrize("limit", [2, 5])
+@pytest.mark.parametrize("url_name", ["items:category-list", "items:category-roots", "items:category-leaves"])
+def test_category_lists(api_client, category_tree, django_assert_num_queries, url_name, limit):
+    with django_assert_num_queries(LIST_QUERIES):
+        response = api_client.get(reverse(url_name), {"limit": limit})
+
+    assert response.status_code == 200
+    assert len(response.json()["results"]) == limit
+
+
+@pytest.mark.parametrize("page_size", [1, 3])
+def test_category_children(api_client, category_tree, django_assert_num_queries, page_size):
+    root = Category.objects.filter(parent=None).first()
+    with django_assert_num_queries(RELATED_QUERIES):
+        response = api_client.get(
+            reverse("items:category-children", kwargs={"slug": root.slug}), {"page_size": page_size}
+        )
+
+    assert response.status_code == 200
+    assert len(response.json()["results"]) == page_size
+
+
+@pytest.mark.parametrize("page_size", [1, 2])
+def test_category_ancestors(api_client, category_tree, django_assert_num_queries, page_size):
+    leaf = Category.objects.filter(level=2).first()
+    with django_assert_num_queries(RELATED_QUERIES):
+        response = api_client.get(
+            reverse("items:category-ancestors", kwargs={"slug": leaf.slug}), {"page_size": page_size}
+        )
+
+    assert response.status_code == 200
+    assert len(response.json()["results"]) == page_size
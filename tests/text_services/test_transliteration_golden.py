@@ -0,0 +1,28 @@
+"""
+to_cyrillic / to_latin must stay byte-identical to the implementation they
+replaced. transliteration_golden.jsonl holds inputs with the outputs of the
+original (one re.sub per exception word) implementation: every exception
+word alone, upper-cased and inside a sentence, that sentence in cyrillic,
+random latin and cyrillic text, and a few real phrases.
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+from apps.text_services.cyrillic_latin_translator import to_cyrillic, to_latin
+
+GOLDEN = [
+    json.loads(line)
+    for line in (Path(__file__).parent / "transliteration_golden.jsonl").read_text(encoding="utf-8").splitlines()
+]
+
+
+@pytest.mark.parametrize("function", [to_cyrillic, to_latin], ids=lambda function: function.__name__)
+def test_matches_golden_corpus(function):
+    mismatches = []
+    for case in GOLDEN:
+        output = function(case["text"])
+        if output != case[function.__name__]:
+            mismatches.append((case["text"], case[function.__name__], output))
+    assert not mismatches, f"{len(mismatches)} of {len(GOLDEN)} differ, first: {mismatches[:3]}"